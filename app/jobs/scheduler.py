@@ -62,11 +62,12 @@ async def periodic_alerts_evaluation_job(context: ContextTypes.DEFAULT_TYPE) ->
         logger.warning("periodic_alerts_evaluation_job: No db_path in job data")
         return
     
+    market_provider = context.job.data.get("market_provider")
+    owns_provider = market_provider is None
     try:
         logger.debug("🔔 Alerts evaluation job: Starting")
         
-        market_provider = context.job.data.get("market_provider")
-        if market_provider is None:
+        if owns_provider:
             # Fallback for backward compatibility
             config = Config.from_env()
             cache = InMemoryCache()
@@ -132,3 +133,7 @@ async def periodic_alerts_evaluation_job(context: ContextTypes.DEFAULT_TYPE) ->
     
     except Exception as e:
         logger.error(f"periodic_alerts_evaluation_job error: {e}", exc_info=True)
+    finally:
+        # A provider built here owns its own SQLite cache connection
+        if owns_provider and market_provider is not None:
+            market_provider.close()
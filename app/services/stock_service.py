@@ -1,5 +1,6 @@
 """Stock analysis service - wraps existing analytics for modular architecture."""
 
+import asyncio
 import logging
 import os
 from typing import Optional, Tuple
@@ -38,9 +39,12 @@ class StockService:
         Returns:
             Tuple of (technical_text, ai_news_text, news_links_text) or (None, None, None) on error
         """
-        # Get price history
-        df, _ = await self.market_provider.get_price_history(
-            ticker, period="6mo", interval="1d", min_rows=30
+        # Price history and news are independent; fetch them concurrently
+        (df, _), news = await asyncio.gather(
+            self.market_provider.get_price_history(
+                ticker, period="6mo", interval="1d", min_rows=30
+            ),
+            self.news_provider.fetch_news(ticker, limit=5),
         )
         if df is None:
             return None, None, None
@@ -66,9 +70,6 @@ class StockService:
         reasons = buy_window.get("reasons", [])[:2]
         reason_lines = "\n".join([f"• {r}" for r in reasons]) if reasons else "• Mixed signals"
 
-        # Get news
-        news = await self.news_provider.fetch_news(ticker, limit=5)
-
         news_lines = ""
         if news:
             top = [item["title"] for item in news[:2] if item.get("title")]
@@ -137,13 +138,21 @@ class StockService:
         Returns:
             Analysis text or None on error
         """
-        result = await buffett_analysis(ticker, self.market_provider, self.sec_provider)
+        # News for the AI recommendation loads while the fundamentals are analyzed.
+        result, news = await asyncio.gather(
+            buffett_analysis(ticker, self.market_provider, self.sec_provider),
+            self.news_provider.fetch_news(ticker, limit=5),
+            return_exceptions=True,
+        )
+        if isinstance(result, BaseException):
+            raise result
         if not result:
             return None
 
         # Add AI recommendation to quality mode (keeps Buffett/Lynch core + news context).
         try:
-            news = await self.news_provider.fetch_news(ticker, limit=5)
+            if isinstance(news, BaseException):
+                raise news
             ai_text = await self.news_provider.summarize_news(ticker, result, news)
             if ai_text:
                 return f"{result}\n\n{ai_text}"
@@ -8,18 +8,23 @@ import sys
 import time
 from datetime import datetime, timezone
 
-import httpx
 from dotenv import load_dotenv
 from telegram.error import Conflict
 
 from chatbot.cache import InMemoryCache
 from chatbot.config import Config
 from chatbot.db import PortfolioDB
+from chatbot.http_client import create_async_client
 from chatbot.providers.market import MarketDataProvider
 from chatbot.providers.news import NewsProvider
 from chatbot.providers.sec_edgar import SECEdgarProvider
 from chatbot.telegram_bot import build_application
 
+try:
+    import uvloop
+except ImportError:  # pragma: no cover - optional dependency
+    uvloop = None
+
 logging.basicConfig(
     format="%(asctime)s | %(name)s | %(levelname)s | %(message)s",
     level=logging.INFO,
@@ -33,6 +38,12 @@ logger = logging.getLogger(__name__)
 def main() -> None:
     load_dotenv()
 
+    # uvloop, when installed, cuts per-await overhead for the provider I/O;
+    # must be set before the polling loop (or any client) creates its loop.
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        logger.info("Using uvloop event loop")
+
     # Load configuration
     config = Config.from_env()
 
@@ -48,10 +59,7 @@ def main() -> None:
         logger.error(f"Database migration failed: {e}")
 
     # Create shared HTTP client with connection pooling
-    http_client = httpx.AsyncClient(
-        timeout=httpx.Timeout(config.http_timeout),
-        limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
-    )
+    http_client = create_async_client(timeout=config.http_timeout)
 
     # Create semaphore for rate limiting
     semaphore = asyncio.Semaphore(config.max_concurrent_requests)
@@ -172,6 +180,10 @@ def main() -> None:
             asyncio.run(http_client.aclose())
         except Exception as exc:
             logger.debug("Failed to close HTTP client: %s", exc)
+        try:
+            market_provider.close()
+        except Exception as exc:
+            logger.debug("Failed to close market data cache: %s", exc)
         # Clean up lock file on exit
         try:
             if os.path.exists(lock_file):
@@ -209,10 +209,8 @@ async def compute_portfolio_risk(
         Dict with risk metrics: vol_ann, beta, var_95_usd, var_95_pct
     """
     tickers = [r["ticker"] for r in positions_data]
-    closes: Dict[str, pd.Series] = {}
     
-    # Fetch price data for all tickers
-    for ticker in tickers:
+    async def _load_close(ticker: str) -> Optional[pd.Series]:
         # Resolve UCITS ETFs to LSE symbols
         provider_symbol = resolve_ticker_for_provider(ticker)
         avg_price = next((r.get("avg") for r in positions_data if r.get("ticker") == ticker), None)
@@ -220,19 +218,20 @@ async def compute_portfolio_risk(
         if _prefer_synthetic_fallback(ticker, provider_symbol, period="1y"):
             fallback_close = _fallback_close_from_avg(ticker, provider_symbol, avg_price, period="1y")
             if fallback_close is not None:
-                closes[ticker] = fallback_close
-                continue
+                return fallback_close
 
-        data, _ = await market_provider.get_price_history(
-            provider_symbol, period="1y", interval="1d", min_rows=30
-        )
+        async with limiter:
+            data, _ = await market_provider.get_price_history(
+                provider_symbol, period="1y", interval="1d", min_rows=30
+            )
         if data is None or "Close" not in data.columns:
-            fallback_close = _fallback_close_from_avg(ticker, provider_symbol, avg_price, period="1y")
-            if fallback_close is None:
-                continue
-            closes[ticker] = fallback_close
-            continue
-        closes[ticker] = data["Close"].dropna()
+            return _fallback_close_from_avg(ticker, provider_symbol, avg_price, period="1y")
+        return data["Close"].dropna()
+    
+    # Fetch price data for all tickers concurrently
+    limiter = asyncio.Semaphore(4)
+    loaded = await asyncio.gather(*(_load_close(t) for t in tickers))
+    closes: Dict[str, pd.Series] = {t: c for t, c in zip(tickers, loaded) if c is not None}
     
     if len(closes) < 1:
         return {"vol_ann": None, "beta": None, "var_95_usd": None, "var_95_pct": None}
@@ -368,28 +367,26 @@ async def compute_portfolio_insights(
     try:
         tickers = [r["ticker"] for r in rows]
         
-        # Fetch price data for all tickers (reuse existing data if possible)
-        closes: Dict[str, pd.Series] = {}
-        for ticker in tickers:
+        # Fetch price data for all tickers concurrently (reuse existing data if possible)
+        async def _load_close(ticker: str) -> Optional[pd.Series]:
             # Resolve UCITS ETFs to LSE symbols
             provider_symbol = resolve_ticker_for_provider(ticker)
 
             avg_price = next((r.get("avg") for r in rows if r.get("ticker") == ticker), None)
             if _prefer_synthetic_fallback(ticker, provider_symbol, period="1y"):
-                fallback_close = _fallback_close_from_avg(ticker, provider_symbol, avg_price, period="1y")
-                if fallback_close is not None:
-                    closes[ticker] = fallback_close
-                continue
+                return _fallback_close_from_avg(ticker, provider_symbol, avg_price, period="1y")
 
-            data, _ = await market_provider.get_price_history(
-                provider_symbol, period="1y", interval="1d", min_rows=60
-            )
+            async with limiter:
+                data, _ = await market_provider.get_price_history(
+                    provider_symbol, period="1y", interval="1d", min_rows=60
+                )
             if data is not None and "Close" in data.columns:
-                closes[ticker] = data["Close"].dropna()
-            else:
-                fallback_close = _fallback_close_from_avg(ticker, provider_symbol, avg_price, period="1y")
-                if fallback_close is not None:
-                    closes[ticker] = fallback_close
+                return data["Close"].dropna()
+            return _fallback_close_from_avg(ticker, provider_symbol, avg_price, period="1y")
+        
+        limiter = asyncio.Semaphore(4)
+        loaded = await asyncio.gather(*(_load_close(t) for t in tickers))
+        closes: Dict[str, pd.Series] = {t: c for t, c in zip(tickers, loaded) if c is not None}
         
         if len(closes) >= 2:
             returns_df = pd.DataFrame({k: v.pct_change() for k, v in closes.items()})
@@ -10,10 +10,35 @@ matplotlib.use('Agg')  # Non-GUI backend
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
 
 logger = logging.getLogger(__name__)
 
 
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """Trailing mean over `window` points (NaN until the window fills), like Series.rolling().mean()."""
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        out[window - 1:] = sliding_window_view(values, window).mean(axis=1)
+    return out
+
+
+def _rsi_values(close: np.ndarray, period: int) -> np.ndarray:
+    """RSI over a float64 close array; undefined points are 50."""
+    delta = np.diff(close, prepend=np.nan)
+    gain = np.where(delta > 0, delta, 0.0)
+    loss = np.where(delta < 0, -delta, 0.0)
+    
+    avg_gain = _rolling_mean(gain, period)
+    avg_loss = _rolling_mean(loss, period)
+    
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rs = avg_gain / np.where(avg_loss == 0, np.nan, avg_loss)
+        rsi = 100 - (100 / (1 + rs))
+    
+    return np.where(np.isnan(rsi), 50.0, rsi)
+
+
 def compute_rsi(close: pd.Series, period: int = 14) -> pd.Series:
     """
     Calculate Relative Strength Index (RSI).
@@ -28,19 +53,8 @@ def compute_rsi(close: pd.Series, period: int = 14) -> pd.Series:
     if isinstance(close, pd.DataFrame):
         close = close.iloc[:, 0]
     
-    close = pd.Series(close).astype(float)
-    delta = close.diff()
-    
-    gain = np.where(delta > 0, delta, 0.0)
-    loss = np.where(delta < 0, -delta, 0.0)
-    
-    avg_gain = pd.Series(gain, index=close.index).rolling(period).mean()
-    avg_loss = pd.Series(loss, index=close.index).rolling(period).mean()
-    
-    rs = avg_gain / avg_loss.replace(0, np.nan)
-    rsi = 100 - (100 / (1 + rs))
-    
-    return rsi.fillna(50)
+    close = pd.Series(close)
+    return pd.Series(_rsi_values(close.to_numpy(dtype=np.float64), period), index=close.index)
 
 
 def add_technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
@@ -53,17 +67,31 @@ def add_technical_indicators(df: pd.DataFrame) -> pd.DataFrame:
     Returns:
         DataFrame with added indicators: SMA20, SMA50, RSI14
     """
-    result = df.copy()
+    close = df["Close"]
     
-    # Ensure Close is a Series
-    if isinstance(result["Close"], pd.DataFrame):
-        result["Close"] = result["Close"].iloc[:, 0]
+    # Ensure Close is a Series (yfinance MultiIndex columns yield a frame)
+    if isinstance(close, pd.DataFrame):
+        close = close.iloc[:, 0]
     
-    result["SMA20"] = result["Close"].rolling(20).mean()
-    result["SMA50"] = result["Close"].rolling(50).mean()
-    result["RSI14"] = compute_rsi(result["Close"], 14)
+    # Indicators run on one float64 array instead of per-indicator pandas rolling objects
+    values = close.to_numpy(dtype=np.float64)
+    indicators = {
+        "SMA20": _rolling_mean(values, 20),
+        "SMA50": _rolling_mean(values, 50),
+        "RSI14": _rsi_values(values, 14),
+    }
     
-    return result
+    if isinstance(df.columns, pd.MultiIndex):
+        result = df.copy()
+        for name, column in indicators.items():
+            result[name] = column
+        return result
+    
+    # Flat columns: attach all indicators with one concat instead of a full
+    # copy followed by per-column inserts
+    stale = df.columns.intersection(list(indicators))
+    base = df.drop(columns=stale) if len(stale) else df
+    return pd.concat([base, pd.DataFrame(indicators, index=df.index)], axis=1)
 
 
 def generate_analysis_text(ticker: str, df: pd.DataFrame) -> str:
@@ -77,14 +105,14 @@ def generate_analysis_text(ticker: str, df: pd.DataFrame) -> str:
     Returns:
         Formatted text analysis
     """
-    last = df.iloc[-1]
-    prev = df.iloc[-2]
-    
-    close = float(last["Close"])
-    daily_change = (close / float(prev["Close"]) - 1) * 100
-    sma20 = float(last["SMA20"])
-    sma50 = float(last["SMA50"])
-    rsi = float(last["RSI14"])
+    # Read the few scalars straight from their columns rather than
+    # materializing whole (mixed-dtype) rows with iloc.
+    close_col = df["Close"]
+    close = float(close_col.iat[-1])
+    daily_change = (close / float(close_col.iat[-2]) - 1) * 100
+    sma20 = float(df["SMA20"].iat[-1])
+    sma50 = float(df["SMA50"].iat[-1])
+    rsi = float(df["RSI14"].iat[-1])
     
     trend = "uptrend" if sma20 > sma50 else "downtrend"
     
@@ -61,9 +61,17 @@ class Config:
     twelvedata_rpm: int = 8  # Free tier: 8 requests per minute
     twelvedata_cache_ttl: int = 600  # Cache for 10 minutes
     
+    # Keyless providers: proactive throttling keeps bursts under upstream 429 thresholds
+    yfinance_rpm: int = 120
+    yfinance_rps: int = 2
+    stooq_rpm: int = 180  # Shared by Stooq and Singapore (same host)
+    stooq_rps: int = 3
+    
     # Network settings
     http_timeout: int = 30
     max_concurrent_requests: int = 5
+    batch_concurrency: int = 10  # Tickers in flight at once in batch price loads
+    compact_ohlcv: bool = False  # Persist cached OHLCV prices as float32 (callers still get float64)
     max_retries: int = 3
     retry_backoff_factor: float = 0.5
     
@@ -105,6 +113,12 @@ class Config:
             twelvedata_api_key=os.getenv("TWELVEDATA_API_KEY", "").strip() or None,
             twelvedata_rpm=int(os.getenv("TWELVEDATA_RPM", "8")),
             twelvedata_cache_ttl=int(os.getenv("TWELVEDATA_CACHE_TTL", "600")),
+            yfinance_rpm=int(os.getenv("YFINANCE_RPM", "120")),
+            yfinance_rps=int(os.getenv("YFINANCE_RPS", "2")),
+            stooq_rpm=int(os.getenv("STOOQ_RPM", "180")),
+            stooq_rps=int(os.getenv("STOOQ_RPS", "3")),
+            batch_concurrency=max(1, int(os.getenv("BATCH_CONCURRENCY", "10"))),
+            compact_ohlcv=os.getenv("COMPACT_OHLCV", "false").strip().lower() in {"1", "true", "yes"},
         )
 
 
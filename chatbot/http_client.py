@@ -7,8 +7,24 @@ from typing import Optional
 
 import httpx
 
+try:
+    import h2  # noqa: F401 - enables HTTP/2 support in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:  # pragma: no cover - optional dependency
+    HTTP2_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Connection pool sizing: keep the pool well above any request semaphore so
+# callers never serialize on pool exhaustion.
+DEFAULT_MAX_CONNECTIONS = 100
+# Enough idle connections to cover a full burst of fallback CSV requests, kept
+# alive long enough (httpx defaults to 5s) to be reused by the next batch.
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 50
+DEFAULT_KEEPALIVE_EXPIRY = 60.0
+# Unreachable hosts fail fast; the full timeout still applies to reads.
+DEFAULT_CONNECT_TIMEOUT = 5.0
+
 # Global HTTP semaphore (limits concurrent requests)
 HTTP_SEMAPHORE = asyncio.Semaphore(10)
 
@@ -16,11 +32,29 @@ HTTP_SEMAPHORE = asyncio.Semaphore(10)
 _http_client: Optional[httpx.AsyncClient] = None
 
 
+def create_async_client(timeout: float = 30) -> httpx.AsyncClient:
+    """
+    Create a pooled AsyncClient, multiplexing over HTTP/2 when h2 is installed.
+    
+    With HTTP/2, concurrent requests to one host (e.g. Stooq CSVs issued via
+    asyncio.gather) share a single TCP/TLS connection instead of one handshake each.
+    """
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(timeout, connect=min(timeout, DEFAULT_CONNECT_TIMEOUT)),
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(
+            max_keepalive_connections=DEFAULT_MAX_KEEPALIVE_CONNECTIONS,
+            max_connections=DEFAULT_MAX_CONNECTIONS,
+            keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY,
+        ),
+    )
+
+
 def get_http_client() -> httpx.AsyncClient:
     """Get or create global HTTP client."""
     global _http_client
     if _http_client is None:
-        _http_client = httpx.AsyncClient(timeout=30)
+        _http_client = create_async_client(timeout=30)
     return _http_client
 
 
@@ -1,17 +1,115 @@
 """Enhanced caching layer for market data with SQLite persistence and TTL."""
 
+import io
 import json
 import logging
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from io import StringIO
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
+import numpy as np
 import pandas as pd
 
+try:
+    import pyarrow as pa
+except ImportError:  # pragma: no cover - optional dependency
+    pa = None
+
 logger = logging.getLogger(__name__)
 
+# Binary OHLCV payload formats, told apart by their leading magic bytes.
+ARROW_IPC_MAGIC = b"ARROW1"
+PARQUET_MAGIC = b"PAR1"
+NPZ_MAGIC = b"PK"  # .npz is a zip archive
+
+# Keys per batched SELECT; stays under SQLite's default bound-parameter limit (999)
+SQLITE_MAX_BATCH_PARAMS = 500
+
+# Applied once to the shared connection: WAL lets readers proceed during batch
+# write storms; NORMAL sync is durable enough for a rebuildable cache.
+SQLITE_PRAGMAS = """
+PRAGMA journal_mode=WAL;
+PRAGMA synchronous=NORMAL;
+PRAGMA mmap_size=268435456;
+PRAGMA cache_size=-65536;
+PRAGMA temp_store=MEMORY;
+"""
+
+
+OHLCV_PRICE_COLUMNS = ("Open", "High", "Low", "Close")
+
+
+def _compact_ohlcv(df: pd.DataFrame) -> pd.DataFrame:
+    """Downcast float64 price columns to float32 for the persisted payload."""
+    return df.astype({
+        col: np.float32 for col in OHLCV_PRICE_COLUMNS
+        if col in df.columns and df[col].dtype == np.float64
+    })
+
+
+def _expand_ohlcv(df: pd.DataFrame) -> pd.DataFrame:
+    """Upcast float32 price columns from a compact payload back to float64."""
+    float32_cols = [
+        col for col in OHLCV_PRICE_COLUMNS
+        if col in df.columns and df[col].dtype == np.float32
+    ]
+    if not float32_cols:
+        return df
+    return df.astype({col: np.float64 for col in float32_cols})
+
+
+def _encode_ohlcv(df: pd.DataFrame) -> Optional[bytes]:
+    """
+    Serialize an OHLCV frame to a compact binary payload.
+    
+    Uses Arrow IPC when pyarrow is installed; otherwise an .npz of the numeric
+    columns and int64 index. Returns None when the frame fits neither encoding.
+    """
+    buffer = io.BytesIO()
+    if pa is not None:
+        table = pa.Table.from_pandas(df)
+        with pa.ipc.new_file(buffer, table.schema) as writer:
+            writer.write_table(table)
+        return buffer.getvalue()
+    
+    if not isinstance(df.index, pd.DatetimeIndex) or not all(
+        pd.api.types.is_numeric_dtype(dtype) for dtype in df.dtypes
+    ):
+        return None
+    index = df.index.tz_convert("UTC") if df.index.tz is not None else df.index
+    index = index.as_unit("ns")  # asi8 is in the index's own unit; the decoder reads ns
+    np.savez(
+        buffer,
+        index=index.asi8,
+        columns=np.array([str(col) for col in df.columns]),
+        **{f"col{i}": df.iloc[:, i].to_numpy() for i in range(df.shape[1])},
+        meta=np.array([df.index.name or "", str(df.index.tz or "")]),
+    )
+    return buffer.getvalue()
+
+
+def _decode_ohlcv(payload: bytes) -> pd.DataFrame:
+    """Deserialize a payload written by _encode_ohlcv (or a legacy parquet blob)."""
+    if payload.startswith(ARROW_IPC_MAGIC):
+        return pa.ipc.open_file(io.BytesIO(payload)).read_all().to_pandas()
+    if payload.startswith(PARQUET_MAGIC):
+        return pd.read_parquet(io.BytesIO(payload))
+    if payload.startswith(NPZ_MAGIC):
+        with np.load(io.BytesIO(payload), allow_pickle=False) as arrays:
+            name, tz = arrays["meta"].tolist()
+            index = pd.DatetimeIndex(arrays["index"].view("datetime64[ns]"), name=name or None)
+            if tz:
+                index = index.tz_localize("UTC").tz_convert(tz)
+            columns = arrays["columns"].tolist()
+            return pd.DataFrame(
+                {col: arrays[f"col{i}"] for i, col in enumerate(columns)}, index=index
+            )
+    raise ValueError("Unknown OHLCV payload format")
+
 
 class DataCache:
     """
@@ -19,19 +117,42 @@ class DataCache:
     
     - RAM cache: In-memory with TTL, fast lookups
     - SQLite cache: Persistent storage, auto-expiry checking
-    - Supports: JSON serialization, DataFrame pickling, string storage
+    - Supports: JSON serialization, binary DataFrame payloads (Arrow IPC/npz), string storage
     """
     
-    def __init__(self, db_path: str = "market_cache.db"):
-        """Initialize cache with SQLite backend."""
+    def __init__(self, db_path: str = "market_cache.db", compact_ohlcv: bool = False):
+        """
+        Initialize cache with SQLite backend.
+        
+        With compact_ohlcv, OHLCV prices are persisted to SQLite as float32 (half
+        the payload size). Frames handed out are always float64: RAM keeps the
+        full-precision frame and SQLite reads are upcast on promotion, so a frame
+        reloaded from disk carries float32 rounding.
+        """
         self.db_path = db_path if db_path != ":memory:" else ":memory:"
+        self.compact_ohlcv = compact_ohlcv
         self.mem_cache: Dict[str, tuple[Any, datetime]] = {}
+        # One connection per cache, shared by every call (and thread) under a lock
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.executescript(SQLITE_PRAGMAS)
+        self._conn_lock = threading.RLock()
         self._init_db()
     
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        """Yield the shared connection; commits on success, rolls back on error."""
+        with self._conn_lock, self._conn:
+            yield self._conn
+    
+    def close(self):
+        """Close the shared SQLite connection."""
+        with self._conn_lock:
+            self._conn.close()
+    
     def _init_db(self):
         """Initialize SQLite tables."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
+            with self._connection() as conn:
                 # Check if tables exist, create if not
                 cursor = conn.cursor()
                 
@@ -73,6 +194,16 @@ class DataCache:
         except Exception as e:
             logger.error(f"Failed to initialize database: {e}")
     
+    def get_memory(self, key: str) -> Optional[Any]:
+        """Return a fresh RAM-cached value without touching SQLite."""
+        entry = self.mem_cache.get(key)
+        if entry is None:
+            return None
+        data, expiry = entry
+        if datetime.now() < expiry:
+            return data
+        return None
+    
     def get_ohlcv(self, key: str, ttl_seconds: int = 3600) -> Optional[pd.DataFrame]:
         """
         Retrieve OHLCV data (DataFrame) from cache.
@@ -83,13 +214,13 @@ class DataCache:
         if key in self.mem_cache:
             data, expiry = self.mem_cache[key]
             if datetime.now() < expiry:
-                logger.debug(f"RAM cache hit: {key}")
+                logger.debug("RAM cache hit: %s", key)
                 return data
             else:
                 del self.mem_cache[key]
         
         # Check SQLite cache
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             row = conn.execute(
                 "SELECT payload_parquet, payload_json, fetched_at, ttl_seconds FROM ohlcv_cache WHERE key = ?",
                 (key,)
@@ -98,7 +229,48 @@ class DataCache:
         if row is None:
             return None
         
-        payload_parquet, payload_json, fetched_at, db_ttl = row
+        return self._promote_ohlcv_row(key, *row)
+    
+    def get_ohlcv_many(self, keys: List[str], ttl_seconds: int = 3600) -> Dict[str, pd.DataFrame]:
+        """
+        Batch variant of get_ohlcv: RAM first, then one SQLite query for the rest.
+        
+        Returns only the keys that were found and not expired.
+        """
+        found: Dict[str, pd.DataFrame] = {}
+        remaining = []
+        for key in dict.fromkeys(keys):
+            data = self.get_memory(key)
+            if data is not None:
+                found[key] = data
+            else:
+                remaining.append(key)
+        
+        for start in range(0, len(remaining), SQLITE_MAX_BATCH_PARAMS):
+            chunk = remaining[start:start + SQLITE_MAX_BATCH_PARAMS]
+            placeholders = ",".join("?" * len(chunk))
+            with self._connection() as conn:
+                rows = conn.execute(
+                    "SELECT key, payload_parquet, payload_json, fetched_at, ttl_seconds "
+                    f"FROM ohlcv_cache WHERE key IN ({placeholders})",
+                    chunk,
+                ).fetchall()
+            for key, *row in rows:
+                df = self._promote_ohlcv_row(key, *row)
+                if df is not None:
+                    found[key] = df
+        
+        return found
+    
+    def _promote_ohlcv_row(
+        self,
+        key: str,
+        payload_parquet: Optional[bytes],
+        payload_json: Optional[str],
+        fetched_at: str,
+        db_ttl: int,
+    ) -> Optional[pd.DataFrame]:
+        """Decode a persisted OHLCV row and promote it to RAM, or drop it if expired."""
         fetched_dt = datetime.fromisoformat(fetched_at)
         
         now = datetime.now()
@@ -110,13 +282,12 @@ class DataCache:
             self._delete_ohlcv(key)
             return None
         
-        logger.debug(f"SQLite cache hit: {key}")
+        logger.debug("SQLite cache hit: %s", key)
         
-        # Reconstruct DataFrame from parquet/JSON
+        # Reconstruct DataFrame from binary payload (Arrow IPC/npz/parquet) or JSON
         try:
             if payload_parquet:
-                import io
-                df = pd.read_parquet(io.BytesIO(payload_parquet))
+                df = _expand_ohlcv(_decode_ohlcv(payload_parquet))
             elif payload_json:
                 df = pd.read_json(StringIO(payload_json))
             else:
@@ -131,22 +302,19 @@ class DataCache:
     
     def set_ohlcv(self, key: str, df: pd.DataFrame, ttl_seconds: int = 3600):
         """Store OHLCV data with TTL."""
-        # Store in RAM cache
+        # Store in RAM cache at full precision
         self.mem_cache[key] = (df, datetime.now() + timedelta(seconds=ttl_seconds))
         
-        # Store in SQLite (parquet for efficiency)
+        # Store in SQLite as a binary payload (column keeps its legacy parquet name)
+        persisted = _compact_ohlcv(df) if self.compact_ohlcv else df
         try:
-            import io
-            parquet_buffer = io.BytesIO()
-            df.to_parquet(parquet_buffer)
-            payload_parquet = parquet_buffer.getvalue()
-            payload_json = None
+            payload_parquet = _encode_ohlcv(persisted)
         except Exception as e:
-            logger.warning(f"Failed to parquet {key}, using JSON: {e}")
+            logger.warning(f"Failed to encode {key}, using JSON: {e}")
             payload_parquet = None
-            payload_json = df.to_json()
+        payload_json = df.to_json() if payload_parquet is None else None
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             conn.execute("""
                 INSERT OR REPLACE INTO ohlcv_cache 
                 (key, payload_parquet, payload_json, fetched_at, ttl_seconds)
@@ -154,7 +322,7 @@ class DataCache:
             """, (key, payload_parquet, payload_json, datetime.now().isoformat(), ttl_seconds))
             conn.commit()
         
-        logger.debug(f"Cached OHLCV: {key} (TTL: {ttl_seconds}s)")
+        logger.debug("Cached OHLCV: %s (TTL: %ss)", key, ttl_seconds)
     
     def get_meta(self, key: str, ttl_seconds: int = 3600) -> Optional[Dict[str, Any]]:
         """Retrieve ticker metadata from cache."""
@@ -162,13 +330,13 @@ class DataCache:
         if key in self.mem_cache:
             data, expiry = self.mem_cache[key]
             if datetime.now() < expiry:
-                logger.debug(f"RAM cache hit: {key}")
+                logger.debug("RAM cache hit: %s", key)
                 return data
             else:
                 del self.mem_cache[key]
         
         # Check SQLite cache
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             row = conn.execute(
                 "SELECT payload_json, fetched_at, ttl_seconds FROM ticker_meta_cache WHERE key = ?",
                 (key,)
@@ -203,7 +371,7 @@ class DataCache:
         self.mem_cache[key] = (data, datetime.now() + timedelta(seconds=ttl_seconds))
         
         # Store in SQLite
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             conn.execute("""
                 INSERT OR REPLACE INTO ticker_meta_cache 
                 (key, payload_json, fetched_at, ttl_seconds)
@@ -211,7 +379,7 @@ class DataCache:
             """, (key, json.dumps(data), datetime.now().isoformat(), ttl_seconds))
             conn.commit()
         
-        logger.debug(f"Cached meta: {key} (TTL: {ttl_seconds}s)")
+        logger.debug("Cached meta: %s (TTL: %ss)", key, ttl_seconds)
     
     def get_etf_facts(self, key: str, ttl_seconds: int = 2592000) -> Optional[Dict[str, Any]]:  # 30 days default
         """Retrieve ETF facts from cache."""
@@ -222,13 +390,13 @@ class DataCache:
         if key in self.mem_cache:
             data, expiry = self.mem_cache[key]
             if datetime.now() < expiry:
-                logger.debug(f"RAM cache hit: {key}")
+                logger.debug("RAM cache hit: %s", key)
                 return data
             else:
                 del self.mem_cache[key]
         
         # Check SQLite cache
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             row = conn.execute(
                 "SELECT payload_json, fetched_at, ttl_seconds FROM etf_facts_cache WHERE key = ?",
                 (key,)
@@ -263,7 +431,7 @@ class DataCache:
         self.mem_cache[key] = (data, datetime.now() + timedelta(seconds=ttl_seconds))
         
         # Store in SQLite
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             conn.execute("""
                 INSERT OR REPLACE INTO etf_facts_cache 
                 (key, payload_json, fetched_at, ttl_seconds)
@@ -271,30 +439,30 @@ class DataCache:
             """, (key, json.dumps(data), datetime.now().isoformat(), ttl_seconds))
             conn.commit()
         
-        logger.debug(f"Cached ETF facts: {key} (TTL: {ttl_seconds}s)")
+        logger.debug("Cached ETF facts: %s (TTL: %ss)", key, ttl_seconds)
     
     def _delete_ohlcv(self, key: str):
         """Remove expired OHLCV from cache."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             conn.execute("DELETE FROM ohlcv_cache WHERE key = ?", (key,))
             conn.commit()
     
     def _delete_meta(self, key: str):
         """Remove expired meta from cache."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             conn.execute("DELETE FROM ticker_meta_cache WHERE key = ?", (key,))
             conn.commit()
     
     def _delete_etf_facts(self, key: str):
         """Remove expired ETF facts from cache."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             conn.execute("DELETE FROM etf_facts_cache WHERE key = ?", (key,))
             conn.commit()
     
     def clear_all(self):
         """Clear all caches (use cautiously)."""
         self.mem_cache.clear()
-        with sqlite3.connect(self.db_path) as conn:
+        with self._connection() as conn:
             conn.execute("DELETE FROM ohlcv_cache")
             conn.execute("DELETE FROM ticker_meta_cache")
             conn.execute("DELETE FROM etf_facts_cache")
@@ -15,16 +15,55 @@ Features:
 import logging
 import asyncio
 import inspect
-from datetime import datetime, timedelta
-from io import StringIO
-from typing import Optional, Dict, Tuple
+from datetime import date, timedelta
+from functools import lru_cache
+from io import BytesIO
+from typing import Optional, Dict, Tuple, Union
 from dataclasses import dataclass
 
 import httpx
 import pandas as pd
 
+from ..http_client import create_async_client
+from .rate_limiter import RateLimiter
+
+try:
+    import pyarrow  # noqa: F401 - enables pandas' multithreaded CSV engine
+    CSV_ENGINE = "pyarrow"
+except ImportError:  # pragma: no cover - optional dependency
+    CSV_ENGINE = "c"
+
 logger = logging.getLogger(__name__)
 
+# Column dtypes for Stooq's fixed daily CSV schema. Prices stay float64 for
+# callers; compact_ohlcv only shrinks the payload DataCache persists to SQLite.
+STOOQ_CSV_DTYPES = {
+    'Open': 'float64', 'High': 'float64', 'Low': 'float64',
+    'Close': 'float64', 'Volume': 'float64',
+}
+
+# Lower-cased header names accepted as the CSV date column
+STOOQ_DATE_COLUMNS = frozenset({'date', 'datetime', 'time'})
+
+# Calendar days requested from Stooq per yfinance-style period
+STOOQ_PERIOD_DAYS = {
+    "1d": 1, "5d": 5, "1mo": 30, "3mo": 90,
+    "6mo": 180, "1y": 365, "2y": 730, "5y": 1825, "max": 3650
+}
+
+
+@lru_cache(maxsize=32)
+def _stooq_date_range(days: int, today: date) -> Tuple[str, str]:
+    """Return Stooq (d1, d2) YYYYMMDD bounds; memoized per calendar day."""
+    start = today - timedelta(days=days)
+    return start.strftime("%Y%m%d"), today.strftime("%Y%m%d")
+
+
+@lru_cache(maxsize=4096)
+def _stooq_url(stooq_ticker: str, d1: str, d2: str) -> str:
+    """Build the Stooq daily CSV URL for a symbol and date range."""
+    return f"https://stooq.com/q/d/l/?s={stooq_ticker}&d1={d1}&d2={d2}&i=d"
+
 
 @dataclass
 class StooqResult:
@@ -53,20 +92,30 @@ class StooqFallbackProvider:
     RETRY_BACKOFF = 2.0  # Exponential backoff multiplier
     RETRY_DELAY_BASE = 0.5  # Base delay in seconds
     
-    def __init__(self, http_client: Optional[httpx.AsyncClient] = None):
+    def __init__(
+        self,
+        http_client: Optional[httpx.AsyncClient] = None,
+        semaphore: Optional[asyncio.Semaphore] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
         """
         Initialize provider with optional HTTP client.
         
         Args:
             http_client: Existing httpx.AsyncClient to reuse (optional)
+            semaphore: Bounds concurrent Stooq requests (optional)
+            rate_limiter: Throttles Stooq request rate (optional)
         """
         self.http_client = http_client
+        self.semaphore = semaphore
+        self.rate_limiter = rate_limiter
         self.own_client = False
+        self._stooq_symbols: Dict[str, str] = {}  # ticker -> Stooq symbol
     
     async def _ensure_client(self):
         """Ensure we have an HTTP client."""
         if self.http_client is None:
-            self.http_client = httpx.AsyncClient(timeout=30)
+            self.http_client = create_async_client(timeout=30)
             self.own_client = True
     
     async def close(self):
@@ -74,6 +123,15 @@ class StooqFallbackProvider:
         if self.own_client and self.http_client:
             await self.http_client.aclose()
     
+    async def _get(self, url: str) -> httpx.Response:
+        """GET a Stooq URL, holding the semaphore (if any) only for the request."""
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+        if self.semaphore is None:
+            return await self.http_client.get(url, timeout=30, follow_redirects=True)
+        async with self.semaphore:
+            return await self.http_client.get(url, timeout=30, follow_redirects=True)
+    
     def _map_us_ticker(self, ticker: str) -> str:
         """
         Map plain US ticker to Stooq format.
@@ -89,47 +147,61 @@ class StooqFallbackProvider:
             _map_us_ticker("AAPL.US") → "AAPL.US"
             _map_us_ticker("VOD.L") → "VOD.L"  # Already has suffix
         """
-        # Already has a suffix
-        if "." in ticker:
-            return ticker
+        stooq_ticker = self._stooq_symbols.get(ticker)
+        if stooq_ticker is not None:
+            return stooq_ticker
         
-        # Plain US ticker without suffix
-        if len(ticker) <= 5 and ticker.isalpha():
-            return f"{ticker}.US"
+        if "." in ticker:
+            # Already has a suffix
+            stooq_ticker = ticker
+        elif len(ticker) <= 5 and ticker.isalpha():
+            # Plain US ticker without suffix
+            stooq_ticker = f"{ticker}.US"
+        else:
+            # Return as-is if unsure
+            stooq_ticker = ticker
         
-        # Return as-is if unsure
-        return ticker
+        self._stooq_symbols[ticker] = stooq_ticker
+        return stooq_ticker
     
-    def _parse_stooq_csv(self, csv_text: str, ticker: str) -> Optional[pd.DataFrame]:
+    def _parse_stooq_csv(self, csv_payload: Union[bytes, str], ticker: str) -> Optional[pd.DataFrame]:
         """
         Parse Stooq CSV response to standard OHLCV DataFrame.
         
         Args:
-            csv_text: Raw CSV response text
+            csv_payload: Raw CSV response body (bytes preferred, avoids a decode/copy)
             ticker: Ticker for logging context
         
         Returns:
             Normalized DataFrame with DatetimeIndex and columns: Open, High, Low, Close, Volume
             None if parse fails
         """
-        if not csv_text or csv_text.strip() == "":
+        if not csv_payload or not csv_payload.strip():
             logger.warning(f"[Stooq] Empty CSV response for {ticker}")
             return None
         
         try:
-            # Parse CSV
-            df = pd.read_csv(StringIO(csv_text))
+            # Parse CSV straight from bytes (pyarrow engine when installed)
+            if isinstance(csv_payload, str):
+                csv_payload = csv_payload.encode("utf-8")
+            try:
+                # Stooq's schema is fixed, so skip per-column type inference
+                df = pd.read_csv(BytesIO(csv_payload), engine=CSV_ENGINE, dtype=STOOQ_CSV_DTYPES)
+            except ValueError:
+                # Non-numeric cells: infer here, coerce to NaN below
+                df = pd.read_csv(BytesIO(csv_payload), engine=CSV_ENGINE)
             
             if df.empty:
                 logger.warning(f"[Stooq] Empty DataFrame for {ticker}")
                 return None
             
-            # Find and rename date column
-            date_col = None
-            for col in df.columns:
-                if col.strip().lower() in ['date', 'datetime', 'time']:
-                    date_col = col.strip()
-                    break
+            # Find the date column: Stooq's canonical header first, scan otherwise
+            date_col = 'Date' if 'Date' in df.columns else None
+            if date_col is None:
+                for col in df.columns:
+                    if col.strip().lower() in STOOQ_DATE_COLUMNS:
+                        date_col = col.strip()
+                        break
             
             if date_col is None:
                 logger.warning(f"[Stooq] No date column for {ticker}. Columns: {df.columns.tolist()}")
@@ -154,24 +226,26 @@ class StooqFallbackProvider:
                 logger.warning(f"[Stooq] Missing columns for {ticker}: {missing}")
                 return None
             
-            # Keep only required columns
-            df = df[['Open', 'High', 'Low', 'Close', 'Volume']].copy()
+            # Keep only required columns, converted to numeric in one pass when
+            # needed (the column selection already yields a new frame, no extra copy)
+            df = df[['Open', 'High', 'Low', 'Close', 'Volume']]
+            if not all(pd.api.types.is_numeric_dtype(dtype) for dtype in df.dtypes):
+                df = df.apply(pd.to_numeric, errors='coerce')
             
-            # Convert to numeric (coerce errors)
-            for col in required_cols:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
-            
-            # Remove NaN rows
-            df = df.dropna()
+            # Drop bars without a close, masking only when one is missing
+            close_missing = df['Close'].isna()
+            if close_missing.any():
+                df = df[~close_missing]
             
             if df.empty:
                 logger.warning(f"[Stooq] DataFrame empty after normalization for {ticker}")
                 return None
             
-            # Sort by date ascending
-            df = df.sort_index()
+            # Sort by date ascending; Stooq already returns ascending rows
+            if not df.index.is_monotonic_increasing:
+                df = df.sort_index()
             
-            logger.debug(f"[Stooq] Parsed {len(df)} rows for {ticker}")
+            logger.debug("[Stooq] Parsed %s rows for %s", len(df), ticker)
             return df
         
         except Exception as e:
@@ -206,17 +280,12 @@ class StooqFallbackProvider:
         await self._ensure_client()
         
         # Map period to days
-        period_to_days = {
-            "1d": 1, "5d": 5, "1mo": 30, "3mo": 90,
-            "6mo": 180, "1y": 365, "2y": 730, "5y": 1825, "max": 3650
-        }
-        days = period_to_days.get(period, 365)
+        days = STOOQ_PERIOD_DAYS.get(period, 365)
         
         # Map ticker to Stooq format
         stooq_ticker = self._map_us_ticker(ticker)
         
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days)
+        url = _stooq_url(stooq_ticker, *_stooq_date_range(days, date.today()))
         
         logger.info(f"[Stooq] Fetching {ticker} ({stooq_ticker}) for {period} ({days} days)")
         
@@ -228,23 +297,10 @@ class StooqFallbackProvider:
                     logger.info(f"[Stooq] Retry {attempt}/{self.MAX_RETRIES} for {ticker} (delay: {delay:.1f}s)")
                     await asyncio.sleep(delay)
                 
-                # Build URL
-                url = (
-                    f"https://stooq.com/q/d/l/"
-                    f"?s={stooq_ticker}"
-                    f"&d1={start_date.strftime('%Y%m%d')}"
-                    f"&d2={end_date.strftime('%Y%m%d')}"
-                    f"&i=d"
-                )
-                
-                logger.debug(f"[Stooq] Requesting: {url}")
+                logger.debug("[Stooq] Requesting: %s", url)
                 
                 # Fetch with timeout
-                response = await self.http_client.get(
-                    url,
-                    timeout=30,
-                    follow_redirects=True
-                )
+                response = await self._get(url)
                 
                 # Check for HTTP errors
                 if response.status_code == 429 or response.status_code == 503:
@@ -264,16 +320,16 @@ class StooqFallbackProvider:
                     await raise_result
                 
                 # Check for empty response
-                if not response.text or response.text.strip() == "":
+                if not response.content or not response.content.strip():
                     logger.warning(f"[Stooq] Empty response for {ticker}")
                     return StooqResult(success=False, error="stooq_empty",
                                      message="Server returned empty data")
                 
                 # Parse CSV
-                df = self._parse_stooq_csv(response.text, ticker)
+                df = self._parse_stooq_csv(response.content, ticker)
                 
                 if df is None:
-                    logger.debug(f"[Stooq] Parse returned None for {ticker}")
+                    logger.debug("[Stooq] Parse returned None for %s", ticker)
                     return StooqResult(success=False, error="stooq_parse_error",
                                      message="CSV parsing failed")
                 
@@ -310,7 +366,7 @@ class StooqFallbackProvider:
             
             except Exception as e:
                 logger.warning(f"[Stooq] Error (attempt {attempt + 1}/{self.MAX_RETRIES}) for {ticker}: {type(e).__name__}")
-                logger.debug(f"[Stooq] Exception details: {e}")
+                logger.debug("[Stooq] Exception details: %s", e)
                 if attempt == self.MAX_RETRIES - 1:
                     return StooqResult(success=False, error="stooq_unknown",
                                      message=f"{type(e).__name__}")
@@ -367,7 +423,7 @@ async def load_market_data_stooq_daily(
         result = await provider.fetch_daily(ticker, period)
         
         if result.success and result.data is not None:
-            logger.debug(f"[Stooq] Returning {len(result.data)} rows for {ticker}")
+            logger.debug("[Stooq] Returning %s rows for %s", len(result.data), ticker)
             return result.data, None
         else:
             logger.warning(f"[Stooq] Failed for {ticker}: {result.error}")
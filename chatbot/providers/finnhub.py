@@ -2,12 +2,16 @@
 
 import asyncio
 import logging
-from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+import random
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Optional
 
 import httpx
+import numpy as np
 import pandas as pd
 
+from ..utils import loads_json
 from .rate_limiter import RateLimiter
 from .cache_v2 import DataCache
 
@@ -20,7 +24,19 @@ FINNHUB_CANDLES_ENDPOINT = f"{FINNHUB_BASE_URL}/stock/candle"
 FINNHUB_QUOTE_TTL_SECONDS = 180
 FINNHUB_CANDLES_TTL_QUOTE_SECONDS = 180
 FINNHUB_CANDLES_TTL_HISTORICAL_SECONDS = 86400
+FINNHUB_CANDLES_QUOTE_WINDOW_SECONDS = 2 * 24 * 60 * 60  # windows up to 2 days count as current-ish
 FETCH_ERR_RATE_LIMIT = "rate_limit"
+FINNHUB_MAX_BACKOFF_SECONDS = 20.0
+# Longer Retry-After waits give up at once; the router puts Finnhub on cooldown instead.
+FINNHUB_MAX_RETRY_AFTER_SECONDS = 5.0
+OHLCV_COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+FINNHUB_FORBIDDEN_COOLDOWN_SECONDS = 15 * 60
+SECONDS_PER_DAY = 86400
+# Lookback window per period; "max" is capped at 20 years.
+FINNHUB_PERIOD_DAYS = {
+    "1d": 1, "5d": 5, "1mo": 30, "3mo": 90, "6mo": 180,
+    "1y": 365, "2y": 730, "5y": 1825, "max": 7300,
+}
 
 
 class FinnhubProvider:
@@ -69,9 +85,9 @@ class FinnhubProvider:
         self.rate_limiter = RateLimiter(rpm=rpm, rps=rps)
         self._last_candles_error: Optional[str] = None
         self._last_candles_retry_after_seconds: Optional[int] = None
-        self._forbidden_until: Optional[datetime] = None
+        self._forbidden_until: float = 0.0  # Unix seconds
         
-        logger.info(f"Initialized FinnhubProvider with RPM={rpm}, RPS={rps}")
+        logger.info("Initialized FinnhubProvider with RPM=%d, RPS=%d", rpm, rps)
 
     async def fetch_ohlcv(
         self,
@@ -85,7 +101,7 @@ class FinnhubProvider:
         Args:
             ticker: Stock ticker (e.g., "AAPL", "VWRA.L")
             period: Time period ("1d", "5d", "1mo", "3mo", "6mo", "1y", "2y", "5y", "max")
-            interval: Candle resolution ("D"=day, "W"=week, "M"=month, "1", "5", "15", "30", "60"=minutes/hours)
+            interval: Data interval; only "1d" is served (others return "unsupported_interval")
             
         Returns:
             ProviderResult with success/data/provider/error (imported from market_router)
@@ -93,13 +109,12 @@ class FinnhubProvider:
         # Import here to avoid circular import
         from .market_router import ProviderResult
         
-        # Map period to resolution for Finnhub (default to daily for non-day periods)
+        # Finnhub free tier only serves daily candles; a daily series is useless to an
+        # intraday caller, so let the router move on without spending a rate-limit token.
         if interval != "1d":
-            # Finnhub free tier best supports daily data
-            logger.info(f"[Finnhub] {interval} not fully supported, using daily (D) for {ticker}")
-            finnhub_resolution = "D"
-        else:
-            finnhub_resolution = "D"
+            logger.debug("[Finnhub] Skipping %s: only daily interval supported (requested: %s)", ticker, interval)
+            return ProviderResult(success=False, error="unsupported_interval", provider="Finnhub")
+        finnhub_resolution = "D"
         
         # Compute Unix timestamps for period
         from_ts, to_ts = self._compute_period_timestamps(period)
@@ -139,32 +154,9 @@ class FinnhubProvider:
         Returns:
             Tuple of (from_ts, to_ts) Unix timestamps
         """
-        now = datetime.now()
-        to_ts = int(now.timestamp())
-        
-        # Parse period
-        if period == "1d":
-            from_ts = int((now - timedelta(days=1)).timestamp())
-        elif period == "5d":
-            from_ts = int((now - timedelta(days=5)).timestamp())
-        elif period == "1mo":
-            from_ts = int((now - timedelta(days=30)).timestamp())
-        elif period == "3mo":
-            from_ts = int((now - timedelta(days=90)).timestamp())
-        elif period == "6mo":
-            from_ts = int((now - timedelta(days=180)).timestamp())
-        elif period == "1y":
-            from_ts = int((now - timedelta(days=365)).timestamp())
-        elif period == "2y":
-            from_ts = int((now - timedelta(days=730)).timestamp())
-        elif period == "5y":
-            from_ts = int((now - timedelta(days=1825)).timestamp())
-        elif period == "max":
-            # Max supported: 20 years
-            from_ts = int((now - timedelta(days=7300)).timestamp())
-        else:
-            # Default to 1 year
-            from_ts = int((now - timedelta(days=365)).timestamp())
+        to_ts = int(time.time())
+        # Unknown periods default to 1 year
+        from_ts = to_ts - FINNHUB_PERIOD_DAYS.get(period, 365) * SECONDS_PER_DAY
         
         return from_ts, to_ts
 
@@ -179,53 +171,17 @@ class FinnhubProvider:
             Dict with keys: price, change_pct, timestamp
             Or None if unavailable
         """
-        cache_key = f"finnhub_quote:{symbol}"
-        
-        # Check cache (3 minutes)
-        cached = self.cache.get_meta(cache_key, ttl_seconds=FINNHUB_QUOTE_TTL_SECONDS)
-        if cached:
-            logger.debug(f"Quote cache hit for {symbol}")
-            return cached
-        
-        try:
-            # Acquire rate limit
-            await self.rate_limiter.acquire(wait=True)
-            
-            # Fetch from API
-            logger.info(f"Fetching quote for {symbol} from Finnhub")
-            response = await self._fetch_with_retry(
-                FINNHUB_QUOTE_ENDPOINT,
-                {"symbol": symbol, "token": self.api_key},
-            )
-            
-            if response is None:
-                return None
-            
-            quote = response.get("c")  # current price
-            change = response.get("d")  # absolute change
-            change_pct = response.get("dp")  # percent change
-            timestamp = response.get("t")  # Unix timestamp
-            
-            # Validate response
-            if quote is None or change_pct is None:
-                logger.warning(f"Invalid quote response for {symbol}: missing fields")
-                return None
-            
-            result = {
-                "price": float(quote),
-                "change_pct": float(change_pct),
-                "timestamp": datetime.fromtimestamp(timestamp) if timestamp else datetime.now(),
-            }
-            
-            # Cache result (3 minutes)
-            self.cache.set_meta(cache_key, result, ttl_seconds=FINNHUB_QUOTE_TTL_SECONDS)
-            
-            logger.info(f"✓ Quote for {symbol}: ${quote} ({change_pct:+.2f}%)")
-            return result
-            
-        except Exception as e:
-            logger.error(f"Error fetching quote for {symbol}: {e}")
-            return None
+        return await self._cached_fetch(
+            symbol,
+            label="Quote",
+            cache_key=f"finnhub_quote:{symbol}",
+            endpoint=FINNHUB_QUOTE_ENDPOINT,
+            params={"symbol": symbol, "token": self.api_key},
+            ttl_seconds=FINNHUB_QUOTE_TTL_SECONDS,
+            getter=self.cache.get_meta,
+            setter=self.cache.set_meta,
+            parser=self._parse_quote_response,
+        )
 
     async def get_candles(
         self,
@@ -247,73 +203,118 @@ class FinnhubProvider:
             DataFrame with DatetimeIndex and columns: Open, High, Low, Close, Volume
             Or None if unavailable
         """
-        cache_key = f"finnhub_candles:{symbol}:{resolution}:{from_ts}:{to_ts}"
-        
-        ttl_seconds = self._candles_ttl_seconds(from_ts, to_ts)
+        # Cache policy: short window/current-ish candles 3 minutes, historical 24 hours
+        if from_ts is None or to_ts is None or to_ts - from_ts > FINNHUB_CANDLES_QUOTE_WINDOW_SECONDS:
+            ttl_seconds = FINNHUB_CANDLES_TTL_HISTORICAL_SECONDS
+        else:
+            ttl_seconds = FINNHUB_CANDLES_TTL_QUOTE_SECONDS
+        return await self._cached_fetch(
+            symbol,
+            label="Candles",
+            cache_key=f"finnhub_candles:{symbol}:{resolution}:{from_ts}:{to_ts}",
+            endpoint=FINNHUB_CANDLES_ENDPOINT,
+            params={
+                "symbol": symbol,
+                "resolution": resolution,
+                "from": from_ts,
+                "to": to_ts,
+                "token": self.api_key,
+            },
+            ttl_seconds=ttl_seconds,
+            getter=self.cache.get_ohlcv,
+            setter=self.cache.set_ohlcv,
+            parser=self._parse_candles_payload,
+        )
 
-        # Check cache
-        cached = self.cache.get_ohlcv(cache_key, ttl_seconds=ttl_seconds)
+    async def _cached_fetch(
+        self,
+        symbol: str,
+        label: str,
+        cache_key: str,
+        endpoint: str,
+        params: Dict[str, Any],
+        ttl_seconds: int,
+        getter: Callable[..., Any],
+        setter: Callable[..., None],
+        parser: Callable[[Dict[str, Any], str], Any],
+    ) -> Any:
+        """
+        Shared cache → rate limit → fetch → parse → cache pipeline for Finnhub endpoints.
+        
+        Args:
+            symbol: Finnhub symbol (for logging and parsing)
+            label: Human-readable endpoint name for logs ("Quote", "Candles")
+            cache_key: DataCache key
+            endpoint: Finnhub endpoint URL
+            params: Query parameters
+            ttl_seconds: Cache TTL for both lookup and store
+            getter: DataCache getter (get_meta / get_ohlcv)
+            setter: DataCache setter (set_meta / set_ohlcv)
+            parser: Converts the JSON payload into the cached value, or None if invalid
+            
+        Returns:
+            Parsed value, or None if unavailable
+        """
+        cached = getter(cache_key, ttl_seconds=ttl_seconds)
         if cached is not None:
-            logger.debug(f"Candles cache hit for {symbol} ({resolution})")
+            logger.debug("%s cache hit for %s", label, symbol)
             return cached
         
         try:
-            # Acquire rate limit
             await self.rate_limiter.acquire(wait=True)
             
-            # Fetch from API
-            logger.info(
-                f"Fetching candles for {symbol} "
-                f"(resolution={resolution}, from={from_ts}, to={to_ts})"
-            )
-            response = await self._fetch_with_retry(
-                FINNHUB_CANDLES_ENDPOINT,
-                {
-                    "symbol": symbol,
-                    "resolution": resolution,
-                    "from": from_ts,
-                    "to": to_ts,
-                    "token": self.api_key,
-                },
-            )
-            
+            logger.info("Fetching %s for %s from Finnhub", label, symbol)
+            response = await self._fetch_with_retry(endpoint, params)
             if response is None:
-                logger.warning(f"No candle data for {symbol}")
+                logger.warning("No %s data for %s", label, symbol)
                 return None
             
-            # Check if response indicates success
-            status = response.get("s")
-            if status != "ok":
-                logger.warning(f"Finnhub returned non-ok status for {symbol}: {status}")
+            result = parser(response, symbol)
+            if result is None:
                 return None
             
-            # Parse response into DataFrame
-            df = self._parse_candles_response(response, symbol)
-            
-            if df is None or df.empty:
-                logger.warning(f"Failed to parse candles for {symbol}")
-                return None
-            
-            # Cache result by policy:
-            # - short window/current-ish candles: 3 minutes
-            # - historical candles: 24 hours
-            self.cache.set_ohlcv(cache_key, df, ttl_seconds=ttl_seconds)
-            
-            logger.info(f"✓ Candles for {symbol}: {len(df)} rows")
-            return df
+            setter(cache_key, result, ttl_seconds=ttl_seconds)
+            logger.info("✓ %s for %s cached (TTL %ds)", label, symbol, ttl_seconds)
+            return result
             
         except Exception as e:
-            logger.error(f"Error fetching candles for {symbol}: {e}")
+            logger.error("Error fetching %s for %s: %s", label, symbol, e)
             return None
 
     @staticmethod
-    def _candles_ttl_seconds(from_ts: int, to_ts: int) -> int:
-        """Return TTL for candles based on requested time window."""
-        if from_ts is None or to_ts is None:
-            return FINNHUB_CANDLES_TTL_HISTORICAL_SECONDS
-        if to_ts - from_ts <= 2 * 24 * 60 * 60:
-            return FINNHUB_CANDLES_TTL_QUOTE_SECONDS
-        return FINNHUB_CANDLES_TTL_HISTORICAL_SECONDS
+    def _parse_quote_response(response: Dict[str, Any], symbol: str) -> Optional[Dict[str, Any]]:
+        """Convert a /quote payload into {price, change_pct, timestamp}."""
+        quote = response.get("c")  # current price
+        change_pct = response.get("dp")  # percent change
+        timestamp = response.get("t")  # Unix timestamp
+        
+        if quote is None or change_pct is None:
+            logger.warning("Invalid quote response for %s: missing fields", symbol)
+            return None
+        
+        return {
+            "price": float(quote),
+            "change_pct": float(change_pct),
+            "timestamp": datetime.fromtimestamp(timestamp) if timestamp else datetime.now(),
+        }
+
+    def _parse_candles_payload(self, response: Dict[str, Any], symbol: str) -> Optional[pd.DataFrame]:
+        """Validate /stock/candle status and parse it into an OHLCV DataFrame."""
+        status = response.get("s")
+        if status != "ok":
+            logger.warning("Finnhub returned non-ok status for %s: %s", symbol, status)
+            return None
+        
+        df = self._parse_candles_response(response, symbol)
+        if df is None or df.empty:
+            logger.warning("Failed to parse candles for %s", symbol)
+            return None
+        return df
+
+    @staticmethod
+    def _backoff_seconds(attempt: int) -> float:
+        """Exponential backoff with full-second jitter, capped at FINNHUB_MAX_BACKOFF_SECONDS."""
+        return min(FINNHUB_MAX_BACKOFF_SECONDS, (2 ** attempt) + random.uniform(0, 1.0))
 
     async def _fetch_with_retry(
         self,
@@ -332,22 +333,28 @@ class FinnhubProvider:
         Returns:
             Parsed JSON response, or None on failure
         """
+        # Fast-skip Finnhub after authentication/permission failures.
+        # Checked once: a 403 inside the loop returns immediately anyway.
+        if time.time() < self._forbidden_until:
+            logger.debug(
+                "Skipping Finnhub request due to recent 403 (%.0fs left)",
+                self._forbidden_until - time.time(),
+            )
+            return None
+
         for attempt in range(max_retries + 1):
             try:
-                # Fast-skip Finnhub after authentication/permission failures.
-                if self._forbidden_until and datetime.now() < self._forbidden_until:
-                    logger.debug(
-                        "Skipping Finnhub request due to recent 403 until %s",
-                        self._forbidden_until.isoformat(),
-                    )
-                    return None
-
                 response = await self.http_client.get(
                     url,
                     params=params,
                     timeout=30,
                 )
                 
+                # Success (common path, checked first)
+                if response.status_code == 200:
+                    self.rate_limiter.reset_429_count()
+                    return loads_json(response.content)
+                
                 # Handle 429 rate limit
                 if response.status_code == 429:
                     retry_after = response.headers.get("Retry-After")
@@ -355,29 +362,36 @@ class FinnhubProvider:
                     
                     self.rate_limiter.record_429()
                     
-                    if attempt < max_retries:
-                        logger.warning(
-                            f"Rate limited (429). "
-                            f"Waiting {wait_time:.1f}s before retry..."
-                        )
-                        await asyncio.sleep(wait_time)
+                    if attempt < max_retries and wait_time <= FINNHUB_MAX_RETRY_AFTER_SECONDS:
+                        # Hold back other coroutines too, not just this retry.
+                        self.rate_limiter.set_cooldown(wait_time)
+                        # Retry through the limiter so the full Retry-After cooldown
+                        # is honoured and the retry spends a token like any request.
+                        # Jitter keeps concurrent callers from retrying in lockstep.
+                        logger.warning("Rate limited (429). Waiting %.1fs before retry...", wait_time)
+                        await asyncio.sleep(random.uniform(0, 0.5))
+                        await self.rate_limiter.acquire(wait=True)
                         continue
-                    else:
-                        logger.error(
-                            f"Rate limited (429) after {max_retries} retries. Giving up."
-                        )
-                        self._last_candles_error = FETCH_ERR_RATE_LIMIT
-                        self._last_candles_retry_after_seconds = int(wait_time) if wait_time > 0 else None
-                        return None
+                    
+                    # Long waits are not slept here: that would hold the router chain
+                    # and the shared limiter lock for the whole Retry-After.
+                    logger.error(
+                        "Rate limited (429) on attempt %d (Retry-After %.1fs). Giving up.",
+                        attempt + 1,
+                        wait_time,
+                    )
+                    self._last_candles_error = FETCH_ERR_RATE_LIMIT
+                    self._last_candles_retry_after_seconds = int(wait_time) if wait_time > 0 else None
+                    return None
                 
                 # Handle other client errors
                 if response.status_code == 400:
-                    logger.warning(f"Bad request (400): {params}")
+                    logger.warning("Bad request (400): %s", params)
                     return None
 
                 # Handle auth/permission issues: avoid repeated slow failures.
                 if response.status_code == 403:
-                    self._forbidden_until = datetime.now() + timedelta(minutes=15)
+                    self._forbidden_until = time.time() + FINNHUB_FORBIDDEN_COOLDOWN_SECONDS
                     logger.warning(
                         "Finnhub returned 403. Disabling Finnhub requests for 15 minutes."
                     )
@@ -386,41 +400,38 @@ class FinnhubProvider:
                 # Handle server errors
                 if response.status_code >= 500:
                     if attempt < max_retries:
-                        wait_time = 1.0 * (2 ** attempt)
+                        wait_time = self._backoff_seconds(attempt)
                         logger.warning(
-                            f"Server error ({response.status_code}). "
-                            f"Retrying in {wait_time:.1f}s..."
+                            "Server error (%d). Retrying in %.1fs...",
+                            response.status_code,
+                            wait_time,
                         )
                         await asyncio.sleep(wait_time)
                         continue
                     else:
                         logger.error(
-                            f"Server error ({response.status_code}) "
-                            f"after {max_retries} retries."
+                            "Server error (%d) after %d retries.",
+                            response.status_code,
+                            max_retries,
                         )
                         return None
                 
-                # Success
-                if response.status_code == 200:
-                    self.rate_limiter.reset_429_count()
-                    return response.json()
-                
                 # Unexpected status
-                logger.warning(f"Unexpected status {response.status_code}")
+                logger.warning("Unexpected status %d", response.status_code)
                 return None
                 
             except asyncio.TimeoutError:
                 if attempt < max_retries:
-                    wait_time = 1.0 * (2 ** attempt)
-                    logger.warning(f"Timeout. Retrying in {wait_time:.1f}s...")
+                    wait_time = self._backoff_seconds(attempt)
+                    logger.warning("Timeout. Retrying in %.1fs...", wait_time)
                     await asyncio.sleep(wait_time)
                     continue
                 else:
-                    logger.error(f"Timeout after {max_retries} retries")
+                    logger.error("Timeout after %d retries", max_retries)
                     return None
             
             except Exception as e:
-                logger.error(f"Unexpected error: {e}")
+                logger.error("Unexpected error: %s", e)
                 return None
         
         return None
@@ -460,26 +471,25 @@ class FinnhubProvider:
             timestamps = response.get("t", [])
             
             if not all([opens, highs, lows, closes, volumes, timestamps]):
-                logger.warning(f"Missing OHLCV data for {symbol}")
+                logger.warning("Missing OHLCV data for %s", symbol)
                 return None
             
-            # Build DataFrame
-            df = pd.DataFrame({
-                "Open": opens,
-                "High": highs,
-                "Low": lows,
-                "Close": closes,
-                "Volume": volumes,
-                "Date": [datetime.fromtimestamp(ts) for ts in timestamps],
-            })
+            columns = (opens, highs, lows, closes, volumes)
+            n_rows = len(timestamps)
+            if any(len(column) != n_rows for column in columns):
+                logger.warning("Mismatched OHLCV array lengths for %s", symbol)
+                return None
             
-            # Set Date as index
-            df.set_index("Date", inplace=True)
-            df.index.name = "Date"
+            # Build a single N x 5 float64 block (no per-column blocks to consolidate)
+            values = np.empty((n_rows, 5), dtype=np.float64)
+            for i, column in enumerate(columns):
+                values[:, i] = np.asarray(column, dtype=np.float64)
             
-            # Ensure numeric types
-            for col in ["Open", "High", "Low", "Close", "Volume"]:
-                df[col] = pd.to_numeric(df[col], errors="coerce")
+            index = pd.DatetimeIndex(
+                [datetime.fromtimestamp(ts) for ts in timestamps],
+                name="Date",
+            )
+            df = pd.DataFrame(values, index=index, columns=OHLCV_COLUMNS)
             
             # Drop any rows with NaN values
             df = df.dropna()
@@ -490,7 +500,7 @@ class FinnhubProvider:
             return df
             
         except Exception as e:
-            logger.error(f"Error parsing candles for {symbol}: {e}")
+            logger.error("Error parsing candles for %s: %s", symbol, e)
             return None
 
     def get_stats(self) -> Dict[str, Any]:
@@ -2,18 +2,27 @@
 
 import asyncio
 import logging
-from typing import Optional, Tuple, Dict
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Tuple, TypeVar
 
 import httpx
 import pandas as pd
 
 from ..cache import CacheInterface
 from ..config import Config
+from ..utils import loads_json
 from .market_router import MarketDataRouter, EtfFactsProvider
 from .cache_v2 import DataCache
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Failed lookups are remembered briefly so dead symbols skip the provider chain;
+# short enough that intermittent outages self-heal.
+NEGATIVE_CACHE_TTL = 900  # 15 minutes
+# Router errors that say nothing about the symbol itself; never negatively cached
+TRANSIENT_ROUTER_ERRORS = frozenset({"rate_limit", "deadline"})
+
 
 class MarketDataProvider:
     """
@@ -30,7 +39,9 @@ class MarketDataProvider:
     - Smart ticker suffix detection (.US for US stocks)
     - Async I/O throughout
     - ETF fundamentals support
-    - **BATCH LOADING**: get_prices_many() for concurrent fetching
+    - **BATCH LOADING**: get_prices_many() for batched/concurrent fetching
+    - Concurrent duplicate requests share one in-flight fetch
+    - Failed tickers are negatively cached for 15 minutes
     
     Fallback Behavior:
     - yfinance fails (rate limit, network error, not found) → try UK/EU provider → try Stooq
@@ -45,6 +56,7 @@ class MarketDataProvider:
         http_client: httpx.AsyncClient,
         semaphore: asyncio.Semaphore,
         portfolio_text: Optional[str] = None,
+        data_cache: Optional[DataCache] = None,
     ):
         self.config = config
         self.cache = cache
@@ -52,8 +64,10 @@ class MarketDataProvider:
         self.semaphore = semaphore
         self.portfolio_text = portfolio_text or config.default_portfolio
         
-        # Initialize v2 routing layer
-        self.data_cache = DataCache("market_cache.db")
+        # Initialize v2 routing layer; pass data_cache to share one SQLite
+        # connection between providers instead of opening another.
+        self._owns_data_cache = data_cache is None
+        self.data_cache = data_cache or DataCache("market_cache.db", compact_ohlcv=config.compact_ohlcv)
         self.router = MarketDataRouter(
             self.data_cache,
             http_client,
@@ -62,6 +76,15 @@ class MarketDataProvider:
             portfolio_text=self.portfolio_text
         )
         self.etf_provider = EtfFactsProvider(self.data_cache)
+        
+        # In-flight fetches, shared by concurrent callers for the same key
+        self._inflight: Dict[Tuple[str, str, str, int], asyncio.Future] = {}
+        self._fx_inflight: Dict[str, asyncio.Future] = {}
+    
+    def close(self) -> None:
+        """Close the SQLite-backed DataCache if this provider created it."""
+        if self._owns_data_cache:
+            self.data_cache.close()
     
     async def get_price_history(
         self,
@@ -74,7 +97,7 @@ class MarketDataProvider:
         Get price history with universal fallback chain (delegate to MarketDataRouter v2).
         
         Uses intelligent provider fallback: yfinance → UK/EU → Stooq
-        All results normalized and cached in dual-layer system.
+        All results normalized and cached by the router's DataCache (RAM + SQLite).
         
         Args:
             ticker: Stock ticker symbol (e.g., "AAPL", "BRK.B", "SBER.RU", "VOD.L")
@@ -85,24 +108,88 @@ class MarketDataProvider:
         Returns:
             (DataFrame, None) on success with columns: Open, High, Low, Close, Volume
             (None, error_reason) on failure where error_reason is one of:
-                - "rate_limit": Primary source exhausted, fallback also failed
+                - "rate_limit": A provider was rate limited and no other provider succeeded
                 - "not_found": Ticker not found in any source
                 - "insufficient_data": Less than min_rows returned
                 - "all_providers_failed": All providers tried, all failed
+                - "deadline": Provider chain ran out of time before any provider succeeded
+        
+        Concurrent calls with the same arguments share a single fetch.
+        """
+        # Hot path: a RAM hit needs neither the in-flight registry nor the router chain.
+        cached = self.router.peek_ohlcv(ticker, period, interval, min_rows)
+        if cached is not None:
+            logger.debug("RAM cache hit for %s (period=%s, interval=%s)", ticker, period, interval)
+            return cached, None
+        
+        failed_reason = self.cache.get(
+            self._negative_cache_key(ticker, period, interval, min_rows),
+            ttl_seconds=NEGATIVE_CACHE_TTL,
+        )
+        if failed_reason is not None:
+            logger.debug("Negative cache hit for %s: %s", ticker, failed_reason)
+            return None, failed_reason
+        
+        return await self._singleflight(
+            self._inflight,
+            (ticker, period, interval, min_rows),
+            lambda: self._fetch_price_history(ticker, period, interval, min_rows),
+        )
+    
+    @staticmethod
+    async def _singleflight(
+        inflight: Dict[Any, asyncio.Future],
+        key: Any,
+        factory: Callable[[], Awaitable[T]],
+    ) -> T:
+        """
+        Await factory() once per key; concurrent callers with the same key share its outcome.
+        
+        If the leading caller is cancelled, its joiners start the fetch again
+        (one of them becomes the new leader) instead of seeing CancelledError.
         """
+        while key in inflight:
+            existing = inflight[key]
+            logger.debug("Joining in-flight fetch for %s", key)
+            try:
+                # Shield so a cancelled waiter does not cancel the shared fetch.
+                return await asyncio.shield(existing)
+            except asyncio.CancelledError:
+                if not existing.cancelled():
+                    raise  # This waiter itself was cancelled
+                logger.debug("In-flight fetch for %s was cancelled; retrying", key)
+        
+        future = asyncio.get_running_loop().create_future()
+        inflight[key] = future
+        try:
+            result = await factory()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as exc:
+            future.set_exception(exc)
+            future.exception()  # Mark retrieved in case nobody else is waiting
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del inflight[key]
+    
+    async def _fetch_price_history(
+        self,
+        ticker: str,
+        period: str,
+        interval: str,
+        min_rows: int,
+    ) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+        """Fetch price history through the router (uncoalesced body of get_price_history)."""
         logger.info(
             "Fetching price history for %s (period=%s, interval=%s, min_rows=%d)",
             ticker, period, interval, min_rows
         )
         
-        # Check legacy cache first (backward compatibility)
-        cache_key = f"market:{ticker}:{period}:{interval}"
-        cached = self.cache.get(cache_key, ttl_seconds=self.config.market_data_cache_ttl)
-        if cached is not None:
-            logger.debug("Legacy cache hit for %s (period=%s, interval=%s)", ticker, period, interval)
-            return cached, None
-        
-        # Use new router with better fallback chain
+        # Router owns OHLCV caching (DataCache RAM + SQLite); no separate legacy copy.
         result = await self.router.get_ohlcv(
             ticker,
             period=period,
@@ -111,16 +198,20 @@ class MarketDataProvider:
         )
         
         if result.success and result.data is not None:
-            # Store in legacy cache as well
-            self.cache.set(cache_key, result.data)
             logger.info("✓ %s: %d rows for %s", result.provider, len(result.data), ticker)
             return result.data, None
         
         # Map router errors to legacy error format
         error_reason = result.error if result.error else "not_found"
         logger.warning("✗ All providers failed for %s: %s", ticker, error_reason)
+        if error_reason not in TRANSIENT_ROUTER_ERRORS:
+            self.cache.set(self._negative_cache_key(ticker, period, interval, min_rows), error_reason)
         return None, error_reason
     
+    @staticmethod
+    def _negative_cache_key(ticker: str, period: str, interval: str, min_rows: int) -> str:
+        return f"market:neg:{ticker}:{period}:{interval}:{min_rows}"
+    
     async def get_prices_many(
         self,
         tickers: list[str],
@@ -132,8 +223,9 @@ class MarketDataProvider:
         Batch fetch price history for multiple tickers concurrently.
         
         This is the performance-optimized batch version of get_price_history.
-        Uses asyncio.gather to fetch all tickers in parallel while respecting
-        the semaphore limit.
+        Cached tickers are read in bulk and cache misses are fetched with one
+        batched yfinance download; the rest go through get_price_history with at most config.batch_concurrency
+        tickers in flight, while respecting the semaphore limit.
         
         Args:
             tickers: List of ticker symbols
@@ -149,18 +241,30 @@ class MarketDataProvider:
             len(tickers), period, interval
         )
         
-        # Create tasks for all tickers
-        tasks = [
-            self.get_price_history(ticker, period, interval, min_rows)
-            for ticker in tickers
-        ]
+        # One bulk cache read plus one batched download resolve most tickers;
+        # only the rest go through the per-ticker provider chain.
+        resolved = await self.router.prefetch_ohlcv_many(tickers, period, interval, min_rows)
+        results: Dict[str, Any] = {ticker: (df, None) for ticker, df in resolved.items()}
         
-        # Execute concurrently
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        # Bounded fan-out: a fixed pool of workers pulls tickers from a shared
+        # iterator, so at most batch_concurrency fetches are alive at once.
+        misses = [ticker for ticker in dict.fromkeys(tickers) if ticker not in results]
+        pending = iter(misses)
+        
+        async def _worker() -> None:
+            for ticker in pending:
+                try:
+                    results[ticker] = await self.get_price_history(ticker, period, interval, min_rows)
+                except Exception as exc:
+                    results[ticker] = exc
+        
+        worker_count = min(max(1, self.config.batch_concurrency), len(misses))
+        await asyncio.gather(*(_worker() for _ in range(worker_count)))
         
         # Build result dict
         price_data = {}
-        for ticker, result in zip(tickers, results):
+        for ticker in tickers:
+            result = results[ticker]
             if isinstance(result, Exception):
                 logger.warning("Exception fetching %s: %s", ticker, result)
                 price_data[ticker] = None
@@ -176,7 +280,7 @@ class MarketDataProvider:
         
         return price_data
     
-    def get_etf_facts(self, ticker: str) -> Optional[dict]:
+    def get_etf_facts(self, ticker: str) -> Optional[Mapping[str, Any]]:
         """Get ETF facts from provider."""
         return self.etf_provider.get_facts(ticker)
 
@@ -212,10 +316,11 @@ class MarketDataProvider:
         # Example: https://open.er-api.com/v6/latest/GBP
         source = "open.er-api.com"
         try:
-            url = f"https://open.er-api.com/v6/latest/{fc}"
-            resp = await self.http_client.get(url, timeout=10)
-            resp.raise_for_status()
-            payload = resp.json()
+            # One response carries every quote currency, so concurrent lookups
+            # for the same base currency share a single request.
+            payload = await self._singleflight(
+                self._fx_inflight, fc, lambda: self._fetch_fx_rates(fc)
+            )
             rates = payload.get("rates", {}) if isinstance(payload, dict) else {}
             rate = rates.get(tc)
             if isinstance(rate, (int, float)) and rate > 0:
@@ -237,3 +342,10 @@ class MarketDataProvider:
                 return 1.0 / float(inv_rate), f"inverse-{inv.get('source', 'cache')}", inv.get("as_of")
 
         return None, "unavailable", None
+
+    async def _fetch_fx_rates(self, base_currency: str) -> Any:
+        """Fetch the latest rates payload for one base currency."""
+        url = f"https://open.er-api.com/v6/latest/{base_currency}"
+        resp = await self.http_client.get(url, timeout=10)
+        resp.raise_for_status()
+        return loads_json(resp.content)
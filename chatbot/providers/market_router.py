@@ -2,21 +2,40 @@
 
 import asyncio
 import logging
+import random
+import threading
 import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
-from datetime import datetime, timedelta
-from io import StringIO
-from typing import Optional, Dict, Any
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from io import BytesIO, StringIO
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Mapping, Tuple, Union
 
 import httpx
 import pandas as pd
+import requests
 import yfinance as yf
 
 from .cache_v2 import DataCache
-from .fallback import StooqFallbackProvider
-from .finnhub import FinnhubProvider
+from .fallback import (
+    CSV_ENGINE,
+    STOOQ_PERIOD_DAYS,
+    StooqFallbackProvider,
+    _stooq_date_range,
+    _stooq_url,
+)
+from .finnhub import OHLCV_COLUMNS, FinnhubProvider
 from .portfolio_fallback import PortfolioFallbackProvider
+from .rate_limiter import RateLimiter
+
+try:
+    from curl_cffi import requests as curl_requests
+except ImportError:  # pragma: no cover - optional dependency
+    curl_requests = None
 
 logger = logging.getLogger(__name__)
 
@@ -26,8 +45,75 @@ TTL_OHLCV_HISTORICAL = 86400  # 24 hours for historical daily bars
 TTL_META_DEFAULT = 86400  # 24 hours
 TTL_ETF_FACTS_DEFAULT = 2592000  # 30 days
 PROVIDER_RATE_LIMIT_COOLDOWN = 180  # 3 minutes
+PROVIDER_HEDGE_DELAY = 2.0  # seconds before a slow provider is raced by the next one
+PROVIDER_CHAIN_DEADLINE = 15.0  # seconds the whole provider chain may run per request
+PROVIDER_DEADLINE_GRACE = 5.0  # extra seconds for keyless providers still untried at the deadline
+# Keyed providers with small per-minute quotas; outside race mode they are only
+# started once every earlier fetch has finished, never as a speculative hedge.
+QUOTA_LIMITED_PROVIDERS = frozenset({"finnhub", "twelvedata", "alphavantage", "polygon"})
 EXCHANGE_SUFFIXES = (".L", ".AS", ".PA", ".DE", ".MI", ".SI")
+UK_EU_SUFFIXES = (".L", ".AS", ".PA", ".DE", ".MI")
 SHORT_HORIZON_PERIODS = {"1d", "5d", "7d", "1mo"}
+YF_MAX_WORKERS = 4
+YF_POOL_SIZE = 20
+# Concurrent Stooq/Singapore CSV requests; half the shared client's connection pool
+FALLBACK_HTTP_CONCURRENCY = 50
+# Default request rates for keyless providers (overridable via Config)
+YF_DEFAULT_RPM = 120
+YF_DEFAULT_RPS = 2
+STOOQ_DEFAULT_RPM = 180
+STOOQ_DEFAULT_RPS = 3
+OHLCV_COLUMN_SET = frozenset(OHLCV_COLUMNS)
+YF_MAX_BACKOFF_SECONDS = 30.0
+YF_RETRY_JITTER_SECONDS = 0.5
+# Transient yfinance failures worth retrying (JSONDecodeError is a ValueError);
+# anything else, e.g. an unknown or delisted ticker, fails fast.
+YF_RETRYABLE_ERRORS: Tuple[type, ...] = (requests.exceptions.RequestException, ValueError)
+
+# Shared yfinance plumbing: one keep-alive HTTP session (cookie/crumb fetched once)
+# and a bounded pool so blocking downloads never starve the default executor.
+if curl_requests is not None:
+    # A browser TLS fingerprint draws far fewer 429s from Yahoo than python-requests.
+    _YF_SESSION = curl_requests.Session(impersonate="chrome")
+    YF_RETRYABLE_ERRORS += (curl_requests.RequestsError,)
+else:
+    _YF_SESSION = requests.Session()
+    # Batched yf.download runs its own worker threads on top of _YF_EXECUTOR; size the
+    # per-host pool (requests defaults to 10) so those connections are kept, not discarded.
+    _YF_SESSION.mount(
+        "https://",
+        requests.adapters.HTTPAdapter(pool_connections=YF_POOL_SIZE, pool_maxsize=YF_POOL_SIZE),
+    )
+_YF_EXECUTOR = ThreadPoolExecutor(max_workers=YF_MAX_WORKERS, thread_name_prefix="yfinance")
+# yf.download collects results in module-level state, so batched downloads must not overlap.
+_YF_DOWNLOAD_LOCK = threading.Lock()
+
+
+def _yf_history(ticker: str, period: str, interval: str) -> Optional[pd.DataFrame]:
+    """
+    Blocking single-ticker yfinance history over the shared session.
+    
+    Ticker.history() returns an exchange-tz index; daily and longer bars are made
+    tz-naive (as yf.download's ignore_tz default does) so they align with the
+    batched download, Stooq, Finnhub and the synthetic fallback.
+    """
+    df = yf.Ticker(ticker, session=_YF_SESSION).history(
+        period=period, interval=interval, auto_adjust=False
+    )
+    if (
+        df is not None
+        and not interval.endswith(("m", "h"))
+        and isinstance(df.index, pd.DatetimeIndex)
+        and df.index.tz is not None
+    ):
+        df.index = df.index.tz_localize(None)
+    return df
+
+
+@lru_cache(maxsize=64)
+def _standard_column_names(columns: Tuple[Any, ...]) -> Tuple[str, ...]:
+    """Stripped, capitalized column names; providers repeat a handful of layouts."""
+    return tuple(str(col).strip().capitalize() for col in columns)
 
 
 def _ohlcv_ttl_for_request(period: str, interval: str) -> int:
@@ -41,6 +127,11 @@ def _ohlcv_ttl_for_request(period: str, interval: str) -> int:
     return TTL_OHLCV_HISTORICAL
 
 
+def _router_cache_key(ticker: str, period: str, interval: str) -> str:
+    """Cache key for router-level OHLCV results, shared by every provider."""
+    return f"router:{ticker.upper()}:{period}:{interval}"
+
+
 def _parse_retry_after_seconds(value: Optional[str]) -> Optional[int]:
     """Parse Retry-After header to integer seconds when possible."""
     if not value:
@@ -59,11 +150,8 @@ class ProviderResult:
     provider: Optional[str] = None  # Which provider returned this
     error: Optional[str] = None
     retry_after_seconds: Optional[int] = None
-    timestamp: Optional[datetime] = None
-    
-    def __post_init__(self):
-        if self.timestamp is None:
-            self.timestamp = datetime.now()
+    # time.monotonic() stamp; nothing formats it as wall-clock time
+    timestamp: float = field(default_factory=time.monotonic)
 
 
 class BaseProvider(ABC):
@@ -96,8 +184,11 @@ class BaseProvider(ABC):
             return None
         
         try:
-            # Standardize column names
-            df.columns = [col.strip().capitalize() for col in df.columns]
+            # Standardize column names in one pass, flattening a single-ticker MultiIndex
+            columns = df.columns.get_level_values(0) if isinstance(df.columns, pd.MultiIndex) else df.columns
+            standard = _standard_column_names(tuple(columns))
+            if tuple(df.columns) != standard:
+                df.columns = standard
             
             # Ensure date index
             if not isinstance(df.index, pd.DatetimeIndex):
@@ -112,29 +203,31 @@ class BaseProvider(ABC):
             df.index.name = 'Date'
             
             # Required columns
-            required = {'Open', 'High', 'Low', 'Close', 'Volume'}
-            present = set(df.columns)
-            
-            if not required.issubset(present):
-                missing = required - present
+            if not OHLCV_COLUMN_SET.issubset(df.columns):
+                missing = [col for col in OHLCV_COLUMNS if col not in df.columns]
                 logger.warning(f"[{self.name}] Missing columns for {ticker}: {missing}")
                 return None
             
-            # Keep only required columns
-            df = df[['Open', 'High', 'Low', 'Close', 'Volume']].copy()
+            # Keep only required columns (list selection already returns a new frame)
+            df = df[OHLCV_COLUMNS]
             
-            # Ensure numeric types
-            for col in required:
-                df[col] = pd.to_numeric(df[col], errors='coerce')
+            # Ensure numeric types; provider frames are usually numeric already,
+            # so only the offending columns (if any) are converted
+            non_numeric = [col for col, dtype in df.dtypes.items() if not pd.api.types.is_numeric_dtype(dtype)]
+            if non_numeric:
+                df = df.assign(**{col: pd.to_numeric(df[col], errors='coerce') for col in non_numeric})
             
-            # Remove NaN rows
-            df = df.dropna()
+            # Drop bars without a close; analytics only consume Close, so a
+            # missing Volume/High/Low (common intraday) keeps the bar
+            close_missing = df['Close'].isna()
+            if close_missing.any():
+                df = df[~close_missing]
             
             if df.empty:
                 logger.warning(f"[{self.name}] Empty DataFrame after normalization for {ticker}")
                 return None
             
-            logger.debug(f"[{self.name}] Normalized {ticker}: {len(df)} rows")
+            logger.debug("[%s] Normalized %s: %s rows", self.name, ticker, len(df))
             return df
         
         except Exception as e:
@@ -145,9 +238,16 @@ class BaseProvider(ABC):
 class ProviderYFinance(BaseProvider):
     """yfinance provider with broad coverage."""
     
-    def __init__(self, cache: DataCache, semaphore: asyncio.Semaphore, http_client: Optional[httpx.AsyncClient] = None):
+    def __init__(
+        self,
+        cache: DataCache,
+        semaphore: asyncio.Semaphore,
+        http_client: Optional[httpx.AsyncClient] = None,
+        rate_limiter: Optional[RateLimiter] = None
+    ):
         super().__init__("yfinance", cache, http_client)
         self.semaphore = semaphore
+        self.rate_limiter = rate_limiter
         self.max_retries = 3
         self.retry_backoff = 1.5  # Exponential backoff multiplier
     
@@ -163,17 +263,19 @@ class ProviderYFinance(BaseProvider):
         # Check cache
         cached = self.cache.get_ohlcv(cache_key)
         if cached is not None:
-            logger.debug(f"[yfinance] Cache hit: {ticker}")
+            logger.debug("[yfinance] Cache hit: %s", ticker)
             return ProviderResult(success=True, data=cached, provider="yfinance-cached")
         
         logger.info(f"[yfinance] Fetching {ticker} ({period}, {interval})")
         
         for attempt in range(self.max_retries):
             try:
+                if self.rate_limiter is not None:
+                    await self.rate_limiter.acquire()
                 async with self.semaphore:
-                    loop = asyncio.get_event_loop()
+                    loop = asyncio.get_running_loop()
                     df = await loop.run_in_executor(
-                        None,
+                        _YF_EXECUTOR,
                         self._download_sync,
                         ticker,
                         period,
@@ -199,17 +301,72 @@ class ProviderYFinance(BaseProvider):
                         provider="yfinance"
                     )
                 
-                logger.debug(f"[yfinance] Attempt {attempt + 1}/{self.max_retries} failed: {e}")
+                logger.debug("[yfinance] Attempt %s/%s failed: %s", attempt + 1, self.max_retries, e)
                 
+                if not isinstance(e, YF_RETRYABLE_ERRORS):
+                    break
                 if attempt < self.max_retries - 1:
-                    await asyncio.sleep(0.5 * (2 ** attempt))
+                    backoff = min(YF_MAX_BACKOFF_SECONDS, 0.5 * (2 ** attempt))
+                    await asyncio.sleep(backoff + random.uniform(0, YF_RETRY_JITTER_SECONDS))
         
         return ProviderResult(success=False, error="failed", provider="yfinance")
     
     @staticmethod
     def _download_sync(ticker: str, period: str, interval: str) -> Optional[pd.DataFrame]:
         """Blocking yfinance download."""
-        return yf.download(ticker, period=period, interval=interval, progress=False)
+        return _yf_history(ticker, period, interval)
+
+    async def fetch_ohlcv_many(
+        self,
+        tickers: List[str],
+        period: str = "1y",
+        interval: str = "1d"
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch several tickers with one batched yfinance download.
+        
+        Returns normalized frames only for tickers present in the batch result;
+        callers fall back to per-ticker fetching for the rest.
+        """
+        if not tickers:
+            return {}
+        
+        logger.info(f"[yfinance] Batch fetching {len(tickers)} tickers ({period}, {interval})")
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+        async with self.semaphore:
+            loop = asyncio.get_running_loop()
+            raw = await loop.run_in_executor(
+                _YF_EXECUTOR, self._download_many_sync, tickers, period, interval
+            )
+        
+        if raw is None or raw.empty or not isinstance(raw.columns, pd.MultiIndex):
+            return {}
+        
+        frames: Dict[str, pd.DataFrame] = {}
+        available = set(raw.columns.get_level_values(0))
+        for ticker in tickers:
+            if ticker not in available:
+                continue
+            df = self._normalize_ohlcv(raw[ticker].dropna(how="all"), ticker)
+            if df is not None:
+                frames[ticker] = df
+        return frames
+    
+    @staticmethod
+    def _download_many_sync(tickers: List[str], period: str, interval: str) -> Optional[pd.DataFrame]:
+        """Blocking batched yfinance download, grouped by ticker."""
+        with _YF_DOWNLOAD_LOCK:
+            return yf.download(
+                tickers,
+                period=period,
+                interval=interval,
+                group_by="ticker",
+                auto_adjust=False,
+                threads=True,
+                progress=False,
+                session=_YF_SESSION,
+            )
 
 
 class ProviderAlphaVantage(BaseProvider):
@@ -237,12 +394,12 @@ class ProviderAlphaVantage(BaseProvider):
         # Check cache
         cached = self.cache.get_ohlcv(cache_key)
         if cached is not None:
-            logger.debug(f"[AlphaVantage] Cache hit: {ticker}")
+            logger.debug("[AlphaVantage] Cache hit: %s", ticker)
             return ProviderResult(success=True, data=cached, provider="alphavantage-cached")
         
         # Alpha Vantage only supports daily interval efficiently (free tier)
         if interval != "1d":
-            logger.debug(f"[AlphaVantage] Skipping {ticker}: Free tier only supports daily interval")
+            logger.debug("[AlphaVantage] Skipping %s: Free tier only supports daily interval", ticker)
             return ProviderResult(success=False, error="unsupported_interval", provider="alphavantage")
         
         logger.info(f"[AlphaVantage] Fetching {ticker} ({period})")
@@ -316,7 +473,7 @@ class ProviderAlphaVantage(BaseProvider):
                         'Volume': int(values.get('5. volume', 0)),
                     })
                 except (ValueError, TypeError, KeyError) as e:
-                    logger.debug(f"[AlphaVantage] Skipping invalid row for {ticker}: {e}")
+                    logger.debug("[AlphaVantage] Skipping invalid row for %s: %s", ticker, e)
                     continue
             
             if not ohlcv_data:
@@ -325,7 +482,8 @@ class ProviderAlphaVantage(BaseProvider):
             
             df = pd.DataFrame(ohlcv_data)
             df.set_index('Date', inplace=True)
-            df = df.sort_index()  # Sort ascending by date
+            if not df.index.is_monotonic_increasing:
+                df = df.sort_index()  # Sort ascending by date
             
             # Normalize columns
             df = self._normalize_ohlcv(df, ticker)
@@ -375,12 +533,12 @@ class ProviderTwelveData(BaseProvider):
         # Check cache
         cached = self.cache.get_ohlcv(cache_key)
         if cached is not None:
-            logger.debug(f"[TwelveData] Cache hit: {ticker}")
+            logger.debug("[TwelveData] Cache hit: %s", ticker)
             return ProviderResult(success=True, data=cached, provider="twelvedata-cached")
         
         # Twelve Data supports daily interval efficiently
         if interval != "1d":
-            logger.debug(f"[TwelveData] Skipping {ticker}: Free tier optimized for daily interval")
+            logger.debug("[TwelveData] Skipping %s: Free tier optimized for daily interval", ticker)
             return ProviderResult(success=False, error="unsupported_interval", provider="twelvedata")
         
         logger.info(f"[TwelveData] Fetching {ticker} ({period})")
@@ -453,7 +611,7 @@ class ProviderTwelveData(BaseProvider):
                         'Volume': int(item.get('volume', 0)),
                     })
                 except (ValueError, TypeError, KeyError) as e:
-                    logger.debug(f"[TwelveData] Skipping invalid row for {ticker}: {e}")
+                    logger.debug("[TwelveData] Skipping invalid row for %s: %s", ticker, e)
                     continue
             
             if not ohlcv_data:
@@ -462,7 +620,8 @@ class ProviderTwelveData(BaseProvider):
             
             df = pd.DataFrame(ohlcv_data)
             df.set_index('Date', inplace=True)
-            df = df.sort_index()  # Sort ascending by date
+            if not df.index.is_monotonic_increasing:
+                df = df.sort_index()  # Sort ascending by date
             
             # Normalize columns
             df = self._normalize_ohlcv(df, ticker)
@@ -512,12 +671,12 @@ class ProviderPolygon(BaseProvider):
         # Check cache
         cached = self.cache.get_ohlcv(cache_key)
         if cached is not None:
-            logger.debug(f"[Polygon] Cache hit: {ticker}")
+            logger.debug("[Polygon] Cache hit: %s", ticker)
             return ProviderResult(success=True, data=cached, provider="polygon-cached")
         
         # Polygon free tier only supports daily bars efficiently
         if interval != "1d":
-            logger.debug(f"[Polygon] Skipping {ticker}: Free tier optimized for daily interval")
+            logger.debug("[Polygon] Skipping %s: Free tier optimized for daily interval", ticker)
             return ProviderResult(success=False, error="unsupported_interval", provider="polygon")
         
         logger.info(f"[Polygon] Fetching {ticker} ({period})")
@@ -614,7 +773,7 @@ class ProviderPolygon(BaseProvider):
                         'Volume': int(bar['v']),
                     })
                 except (ValueError, TypeError, KeyError) as e:
-                    logger.debug(f"[Polygon] Skipping invalid row for {ticker}: {e}")
+                    logger.debug("[Polygon] Skipping invalid row for %s: %s", ticker, e)
                     continue
             
             if not ohlcv_data:
@@ -623,7 +782,8 @@ class ProviderPolygon(BaseProvider):
             
             df = pd.DataFrame(ohlcv_data)
             df.set_index('Date', inplace=True)
-            df = df.sort_index()  # Sort ascending by date
+            if not df.index.is_monotonic_increasing:
+                df = df.sort_index()  # Sort ascending by date
             
             # Normalize columns
             df = self._normalize_ohlcv(df, ticker)
@@ -651,9 +811,17 @@ class ProviderPolygon(BaseProvider):
 class ProviderStooq(BaseProvider):
     """Stooq provider as universal fallback using production-grade StooqFallbackProvider."""
     
-    def __init__(self, cache: DataCache, http_client: httpx.AsyncClient):
+    def __init__(
+        self,
+        cache: DataCache,
+        http_client: httpx.AsyncClient,
+        http_semaphore: Optional[asyncio.Semaphore] = None,
+        rate_limiter: Optional[RateLimiter] = None
+    ):
         super().__init__("Stooq", cache, http_client)
-        self.fallback = StooqFallbackProvider(http_client)
+        self.fallback = StooqFallbackProvider(
+            http_client, semaphore=http_semaphore, rate_limiter=rate_limiter
+        )
 
     @staticmethod
     def _parse_stooq_csv(csv_text: str) -> Optional[pd.DataFrame]:
@@ -703,12 +871,12 @@ class ProviderStooq(BaseProvider):
         # Check cache
         cached = self.cache.get_ohlcv(cache_key)
         if cached is not None:
-            logger.debug(f"[Stooq] Cache hit: {ticker}")
+            logger.debug("[Stooq] Cache hit: %s", ticker)
             return ProviderResult(success=True, data=cached, provider="stooq-cached")
         
         # Only fetch from Stooq for daily interval
         if interval != "1d":
-            logger.debug(f"[Stooq] Skipping {ticker}: Stooq only supports daily interval (requested: {interval})")
+            logger.debug("[Stooq] Skipping %s: Stooq only supports daily interval (requested: %s)", ticker, interval)
             return ProviderResult(success=False, error="unsupported_interval", provider="stooq")
         
         logger.info(f"[Stooq] Fetching {ticker} ({period}, as fallback)")
@@ -731,8 +899,14 @@ class ProviderStooq(BaseProvider):
 class ProviderForUK_EU(BaseProvider):
     """Provider for UK/EU stocks with LSE, Euronext support."""
     
-    def __init__(self, cache: DataCache, http_client: httpx.AsyncClient):
+    def __init__(
+        self,
+        cache: DataCache,
+        http_client: httpx.AsyncClient,
+        rate_limiter: Optional[RateLimiter] = None
+    ):
         super().__init__("UK_EU", cache, http_client)
+        self.rate_limiter = rate_limiter
     
     async def fetch_ohlcv(
         self,
@@ -742,7 +916,7 @@ class ProviderForUK_EU(BaseProvider):
     ) -> ProviderResult:
         """Fetch UK/EU stocks (LSE .L, Euronext variants)."""
         # This provider is specifically for .L, .AS, .PA, etc.
-        if not any(suffix in ticker.upper() for suffix in ['.L', '.AS', '.PA', '.DE', '.MI']):
+        if not ticker.upper().endswith(UK_EU_SUFFIXES):
             return ProviderResult(success=False, error="not_applicable", provider="uk_eu")
         
         cache_key = f"uk_eu:{ticker}:{period}"
@@ -750,15 +924,17 @@ class ProviderForUK_EU(BaseProvider):
         # Check cache
         cached = self.cache.get_ohlcv(cache_key)
         if cached is not None:
-            logger.debug(f"[UK_EU] Cache hit: {ticker}")
+            logger.debug("[UK_EU] Cache hit: %s", ticker)
             return ProviderResult(success=True, data=cached, provider="uk_eu-cached")
         
         logger.info(f"[UK_EU] Fetching {ticker} ({period})")
         
         try:
             # Try yfinance with the full ticker including suffix
-            loop = asyncio.get_event_loop()
-            df = await loop.run_in_executor(None, yf.download, ticker, period, interval, False)
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire()
+            loop = asyncio.get_running_loop()
+            df = await loop.run_in_executor(_YF_EXECUTOR, _yf_history, ticker, period, interval)
             
             if df is not None:
                 df = self._normalize_ohlcv(df, ticker)
@@ -768,7 +944,7 @@ class ProviderForUK_EU(BaseProvider):
                     return ProviderResult(success=True, data=df, provider="uk_eu")
         
         except Exception as e:
-            logger.debug(f"[UK_EU] Error fetching {ticker}: {e}")
+            logger.debug("[UK_EU] Error fetching %s: %s", ticker, e)
         
         return ProviderResult(success=False, error="failed", provider="uk_eu")
 
@@ -859,33 +1035,36 @@ class EtfFactsProvider:
         },
     }
     
+    # Read-only views of the local database, shared by every caller without copying
+    _FROZEN_ETF_FACTS = {
+        ticker: MappingProxyType(facts) for ticker, facts in LOCAL_ETF_FACTS.items()
+    }
+    
     def __init__(self, cache: DataCache):
         self.cache = cache
     
-    def get_facts(self, ticker: str) -> Optional[Dict[str, Any]]:
+    def get_facts(self, ticker: str) -> Optional[Mapping[str, Any]]:
         """
         Get ETF facts with fallback chain.
         
-        1. Check cache (30 days)
-        2. Check local database
+        1. Check local database (read-only mapping; copy before mutating)
+        2. Check cache (30 days)
         3. Return None if not found
         """
         ticker_upper = ticker.upper()
         
-        # Check cache first
+        # Local facts are in-process constants; no cache round-trip needed
+        facts = self._FROZEN_ETF_FACTS.get(ticker_upper)
+        if facts is not None:
+            logger.debug("[EtfFacts] Local database hit: %s", ticker)
+            return facts
+        
         cached = self.cache.get_etf_facts(f"etf:{ticker_upper}", ttl_seconds=TTL_ETF_FACTS_DEFAULT)
         if cached:
-            logger.debug(f"[EtfFacts] Cache hit: {ticker}")
+            logger.debug("[EtfFacts] Cache hit: %s", ticker)
             return cached
         
-        # Check local database
-        if ticker_upper in self.LOCAL_ETF_FACTS:
-            facts = self.LOCAL_ETF_FACTS[ticker_upper].copy()
-            self.cache.set_etf_facts(f"etf:{ticker_upper}", facts, ttl_seconds=TTL_ETF_FACTS_DEFAULT)
-            logger.debug(f"[EtfFacts] Local database hit: {ticker}")
-            return facts
-        
-        logger.debug(f"[EtfFacts] Not found: {ticker}")
+        logger.debug("[EtfFacts] Not found: %s", ticker)
         return None
 
 
@@ -895,12 +1074,29 @@ class ProviderSingapore(BaseProvider):
     # List of known Singapore tickers (avoid making spurious requests)
     SINGAPORE_TICKERS = {'SSLN', 'SSLN.SI', 'ES3', 'ES3.SI', 'O87', 'O87.SI'}
     
-    def __init__(self, cache: DataCache, http_client: httpx.AsyncClient):
+    def __init__(
+        self,
+        cache: DataCache,
+        http_client: httpx.AsyncClient,
+        http_semaphore: Optional[asyncio.Semaphore] = None,
+        rate_limiter: Optional[RateLimiter] = None
+    ):
         super().__init__("Singapore", cache, http_client)
+        self.http_semaphore = http_semaphore
+        self.rate_limiter = rate_limiter
         self.max_retries = 3
         self.retry_backoff = 2.0
         self.retry_delay_base = 0.5
     
+    async def _get(self, url: str) -> httpx.Response:
+        """GET a Stooq URL, holding the semaphore (if any) only for the request."""
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+        if self.http_semaphore is None:
+            return await self.http_client.get(url, timeout=30, follow_redirects=True)
+        async with self.http_semaphore:
+            return await self.http_client.get(url, timeout=30, follow_redirects=True)
+    
     async def fetch_ohlcv(
         self,
         ticker: str,
@@ -911,26 +1107,30 @@ class ProviderSingapore(BaseProvider):
         # Only attempt Singapore provider for Singapore-specific tickers
         ticker_upper = ticker.upper()
         if ticker_upper not in self.SINGAPORE_TICKERS and not ticker_upper.endswith(".SI"):
-            logger.debug(f"[Singapore] Skipping {ticker}: Not a Singapore ticker")
+            logger.debug("[Singapore] Skipping %s: Not a Singapore ticker", ticker)
             return ProviderResult(success=False, error="not_applicable", provider="singapore")
         
         # Map period to days
-        period_days = {
-            "1d": 1, "5d": 5, "1mo": 30, "3mo": 90,
-            "6mo": 180, "1y": 365, "2y": 730, "5y": 1825, "max": 3650
-        }
-        days = period_days.get(period, 365)
+        days = STOOQ_PERIOD_DAYS.get(period, 365)
         
         cache_key = f"sg:{ticker}:{period}"
         
         # Check cache
         cached = self.cache.get_ohlcv(cache_key)
         if cached is not None:
-            logger.debug(f"[Singapore] Cache hit: {ticker}")
+            logger.debug("[Singapore] Cache hit: %s", ticker)
             return ProviderResult(success=True, data=cached, provider="sg-cached")
         
         logger.info(f"[Singapore] Fetching {ticker} ({period})")
         
+        # Ensure ticker has .SI suffix for Singapore Exchange
+        sg_ticker = ticker
+        if not ticker.endswith(".SI"):
+            sg_ticker = f"{ticker}.SI"
+        
+        # Alternative: Try Stooq with .SI suffix directly; URL memoized per symbol and day
+        url = _stooq_url(sg_ticker, *_stooq_date_range(days, date.today()))
+        
         for attempt in range(self.max_retries):
             try:
                 # Calculate delay with exponential backoff
@@ -939,46 +1139,14 @@ class ProviderSingapore(BaseProvider):
                     logger.info(f"[Singapore] Retry {attempt}/{self.max_retries} for {ticker} (delay: {delay:.1f}s)")
                     await asyncio.sleep(delay)
                 
-                end_date = datetime.now()
-                start_date = end_date - timedelta(days=days)
-                
-                # Ensure ticker has .SI suffix for Singapore Exchange
-                sg_ticker = ticker
-                if not ticker.endswith(".SI"):
-                    sg_ticker = f"{ticker}.SI"
-                
-                # Alternative: Try Stooq with .SI suffix directly
-                url = (
-                    f"https://stooq.com/q/d/l/"
-                    f"?s={sg_ticker}"
-                    f"&d1={start_date.strftime('%Y%m%d')}"
-                    f"&d2={end_date.strftime('%Y%m%d')}"
-                    f"&i=d"
-                )
-                
-                response = await self.http_client.get(url, timeout=30, follow_redirects=True)
+                response = await self._get(url)
                 response.raise_for_status()
                 
                 # Parse CSV
-                df = self._parse_singapore_csv(response.text)
+                df = self._parse_singapore_csv(response.content)
                 if df is None or df.empty:
-                    logger.debug(f"[Singapore] Parse failed or empty data for {ticker}")
-                    # Try without .SI suffix as fallback
-                    if sg_ticker.endswith(".SI"):
-                        continue
-                    sg_ticker_alt = f"{ticker}.SI"
-                    url_alt = (
-                        f"https://stooq.com/q/d/l/"
-                        f"?s={sg_ticker_alt}"
-                        f"&d1={start_date.strftime('%Y%m%d')}"
-                        f"&d2={end_date.strftime('%Y%m%d')}"
-                        f"&i=d"
-                    )
-                    response_alt = await self.http_client.get(url_alt, timeout=30, follow_redirects=True)
-                    response_alt.raise_for_status()
-                    df = self._parse_singapore_csv(response_alt.text)
-                    if df is None or df.empty:
-                        continue
+                    logger.debug("[Singapore] Parse failed or empty data for %s", ticker)
+                    continue
                 
                 df = self._normalize_ohlcv(df, ticker)
                 if df is not None:
@@ -1002,34 +1170,38 @@ class ProviderSingapore(BaseProvider):
         return ProviderResult(success=False, error="failed", provider="singapore")
     
     @staticmethod
-    def _parse_singapore_csv(csv_text: str) -> Optional[pd.DataFrame]:
+    def _parse_singapore_csv(csv_payload: Union[bytes, str]) -> Optional[pd.DataFrame]:
         """Parse Singapore ETF CSV response with flexible handling for regional data."""
+        if isinstance(csv_payload, str):
+            csv_payload = csv_payload.encode("utf-8")
         try:
-            df = pd.read_csv(StringIO(csv_text), parse_dates=['Date'], index_col='Date')
-        except (KeyError, ValueError):
-            try:
-                df = pd.read_csv(StringIO(csv_text))
-                
-                # Find date column
-                date_col = None
+            # Parse straight from the response bytes, once (pyarrow engine when installed)
+            df = pd.read_csv(BytesIO(csv_payload), engine=CSV_ENGINE)
+            
+            # Find date column
+            date_col = 'Date' if 'Date' in df.columns else None
+            if date_col is None:
                 for col in df.columns:
                     if col.lower() in ['date', 'timestamp', 'time', '<date>']:
                         date_col = col
                         break
-                
-                if date_col is None:
-                    logger.warning(f"No date column in Singapore CSV. Columns: {df.columns.tolist()}")
-                    return None
-                
-                df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
-                df.set_index(date_col, inplace=True)
-            except Exception as e:
-                logger.error(f"Failed to parse Singapore CSV: {e}")
+            
+            if date_col is None:
+                logger.warning(f"No date column in Singapore CSV. Columns: {df.columns.tolist()}")
                 return None
+            
+            df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
+            df.set_index(date_col, inplace=True)
+        except Exception as e:
+            logger.error(f"Failed to parse Singapore CSV: {e}")
+            return None
         
-        # Sort by date
-        df = df.sort_index()
-        return df if not df.empty else None
+        if df.empty:
+            return None
+        # Sort by date (in place: the frame is ours)
+        if not df.index.is_monotonic_increasing:
+            df.sort_index(inplace=True)
+        return df
 
 
 class MarketDataRouter:
@@ -1054,6 +1226,18 @@ class MarketDataRouter:
         self.cache = cache
         self.http_client = http_client
         self.semaphore = semaphore
+        # Back-pressure for the CSV fallbacks, which otherwise fan out unbounded
+        self.http_semaphore = asyncio.Semaphore(FALLBACK_HTTP_CONCURRENCY)
+        # Per-host request rate for keyless providers: yfinance and UK_EU share
+        # Yahoo; Stooq and Singapore share stooq.com
+        self.yahoo_limiter = RateLimiter(
+            rpm=getattr(config, "yfinance_rpm", YF_DEFAULT_RPM),
+            rps=getattr(config, "yfinance_rps", YF_DEFAULT_RPS),
+        )
+        self.stooq_limiter = RateLimiter(
+            rpm=getattr(config, "stooq_rpm", STOOQ_DEFAULT_RPM),
+            rps=getattr(config, "stooq_rps", STOOQ_DEFAULT_RPS),
+        )
         self.config = config
         self.portfolio_text = portfolio_text
         
@@ -1132,10 +1316,10 @@ class MarketDataRouter:
         # Add traditional providers as fallback
         # NOTE: Stooq is moved to position after API providers for US stocks, since yfinance is often rate-limited
         self.providers.extend([
-            ProviderStooq(cache, http_client),  # Universal fallback - now PRIMARY after API providers
-            ProviderYFinance(cache, semaphore, http_client),  # Multi-interval support
-            ProviderForUK_EU(cache, http_client),  # UK/Euronext specific
-            ProviderSingapore(cache, http_client),  # Singapore/regional ETFs (.SI suffix)
+            ProviderStooq(cache, http_client, self.http_semaphore, self.stooq_limiter),  # Universal fallback - now PRIMARY after API providers
+            ProviderYFinance(cache, semaphore, http_client, self.yahoo_limiter),  # Multi-interval support
+            ProviderForUK_EU(cache, http_client, self.yahoo_limiter),  # UK/Euronext specific
+            ProviderSingapore(cache, http_client, self.http_semaphore, self.stooq_limiter),  # Singapore/regional ETFs (.SI suffix)
         ])
         
         self.etf_provider = EtfFactsProvider(cache)
@@ -1145,8 +1329,8 @@ class MarketDataRouter:
             "total_requests": 0,
             "successful_requests": 0,
             "failed_requests": 0,
-            "providers_used": {},  # {provider_name: count}
-            "errors": {}  # {error_type: count}
+            "providers_used": Counter(),  # {provider_name: count}
+            "errors": Counter()  # {error_type: count}
         }
         self._provider_cooldowns: Dict[str, float] = {}
 
@@ -1172,8 +1356,7 @@ class MarketDataRouter:
 
     @staticmethod
     def _is_exchange_suffix_ticker(ticker: str) -> bool:
-        ticker_upper = ticker.upper()
-        return any(ticker_upper.endswith(suffix) for suffix in EXCHANGE_SUFFIXES)
+        return ticker.upper().endswith(EXCHANGE_SUFFIXES)
 
     def _providers_for_ticker(self, ticker: str, period: str) -> list[Any]:
         """
@@ -1208,7 +1391,8 @@ class MarketDataRouter:
         ticker: str,
         period: str = "1y",
         interval: str = "1d",
-        min_rows: int = 30
+        min_rows: int = 30,
+        race_mode: bool = False
     ) -> ProviderResult:
         """
         Get OHLCV data with automatic fallback chain.
@@ -1223,18 +1407,24 @@ class MarketDataRouter:
         7. Portfolio fallback (always available - synthetic data from portfolio prices)
         
         All results are normalized and cached.
+        
+        Slow providers are hedged by the next keyless one after PROVIDER_HEDGE_DELAY;
+        quota-limited providers (Finnhub, Twelve Data, Alpha Vantage, Polygon)
+        are only tried strictly in order. With race_mode, every eligible provider starts at once and the first
+        usable result wins (spends quota on rate-limited providers). A chain that
+        runs out of time fails with error="deadline".
         """
         # Track request
         self.stats["total_requests"] += 1
         
         logger.info(f"[Router] Fetching {ticker} ({period}, {interval}) - starting fallback chain")
 
-        router_cache_key = f"router:{ticker}:{period}:{interval}"
+        router_cache_key = _router_cache_key(ticker, period, interval)
         cached = self.cache.get_ohlcv(router_cache_key, ttl_seconds=_ohlcv_ttl_for_request(period, interval))
         if cached is not None and len(cached) >= min_rows:
             logger.debug("[Router] Cache hit before provider chain: %s", router_cache_key)
             self.stats["successful_requests"] += 1
-            self.stats["providers_used"]["router-cached"] = self.stats["providers_used"].get("router-cached", 0) + 1
+            self.stats["providers_used"]["router-cached"] += 1
             return ProviderResult(success=True, data=cached, provider="router-cached")
 
         # Fast path for short-horizon exchange tickers when we already have portfolio anchor.
@@ -1243,9 +1433,7 @@ class MarketDataRouter:
             portfolio_df = await self.portfolio_fallback.fetch_ohlcv(ticker, self.portfolio_prices, period)
             if portfolio_df is not None and len(portfolio_df) >= min_rows:
                 self.stats["successful_requests"] += 1
-                self.stats["providers_used"]["portfolio-fallback-fast"] = (
-                    self.stats["providers_used"].get("portfolio-fallback-fast", 0) + 1
-                )
+                self.stats["providers_used"]["portfolio-fallback-fast"] += 1
                 self.cache.set_ohlcv(
                     router_cache_key,
                     portfolio_df,
@@ -1258,64 +1446,23 @@ class MarketDataRouter:
                     error=None,
                 )
         
-        providers_for_request = self._providers_for_ticker(ticker, period)
-        for idx, provider in enumerate(providers_for_request, 1):
-            if self._provider_on_cooldown(provider):
-                logger.debug(
-                    "[Router] Skipping %s for %s: cooldown active",
-                    provider.name,
-                    ticker,
-                )
-                continue
-
-            try:
-                logger.debug(f"[Router] Attempt {idx}: Trying {provider.name} for {ticker}")
-                result = await provider.fetch_ohlcv(ticker, period, interval)
-                
-                if result.success and result.data is not None and len(result.data) >= min_rows:
-                    # Track success
-                    self.stats["successful_requests"] += 1
-                    provider_name = result.provider.split("-")[0]  # Remove "-cached" suffix if present
-                    self.stats["providers_used"][provider_name] = self.stats["providers_used"].get(provider_name, 0) + 1
-                    
-                    # Enhanced logging showing which provider succeeded
-                    if provider_name.lower() == "stooq":
-                        logger.info(f"[Router] ✓ Fallback success: {ticker} from Stooq ({len(result.data)} rows after yfinance failed)")
-                    else:
-                        logger.info(f"[Router] ✓ Primary success: {ticker} from {result.provider} ({len(result.data)} rows)")
-                    self.cache.set_ohlcv(
-                        router_cache_key,
-                        result.data,
-                        ttl_seconds=_ohlcv_ttl_for_request(period, interval),
-                    )
-                    return result
-                
-                if result.error == "rate_limit":
-                    logger.warning(f"[Router] {result.provider} rate limited, trying next provider...")
-                    self._mark_provider_rate_limited_for(provider, result.retry_after_seconds)
-                    continue
-                    
-                if result.error == "unsupported_interval":
-                    logger.debug(f"[Router] {result.provider} doesn't support {interval}, trying next provider...")
-                    continue
-            
-            except Exception as e:
-                error_type = type(e).__name__
-                self.stats["errors"][error_type] = self.stats["errors"].get(error_type, 0) + 1
-                error_lower = str(e).lower()
-                if "429" in error_lower or "rate limit" in error_lower:
-                    retry_after = _parse_retry_after_seconds(
-                        getattr(getattr(e, "response", None), "headers", {}).get("Retry-After")
-                        if getattr(e, "response", None) is not None
-                        else None
-                    )
-                    self._mark_provider_rate_limited_for(provider, retry_after)
-                logger.warning(f"[Router] {provider.name} raised {error_type}, trying next provider: {e}")
-                continue
+        result = await self._fetch_hedged(
+            self._providers_for_ticker(ticker, period),
+            ticker,
+            period,
+            interval,
+            min_rows,
+            hedge_delay=0.0 if race_mode else PROVIDER_HEDGE_DELAY,
+            deadline=PROVIDER_CHAIN_DEADLINE,
+            grace=PROVIDER_DEADLINE_GRACE,
+            hedge_quota_limited=race_mode,
+        )
+        if result.success:
+            return result
         
         # Track failure
         self.stats["failed_requests"] += 1
-        logger.error(f"[Router] ✗ All providers exhausted for {ticker} - fallback chain complete but unsuccessful")
+        logger.error(f"[Router] ✗ All providers exhausted for {ticker} - fallback chain unsuccessful ({result.error})")
         
         # LAST RESORT: Try portfolio fallback if available
         if self.portfolio_prices:
@@ -1325,7 +1472,7 @@ class MarketDataRouter:
                 if portfolio_df is not None and len(portfolio_df) >= min_rows:
                     logger.info(f"[Router] ✓ Portfolio fallback success: {ticker} ({len(portfolio_df)} rows of synthetic data)")
                     self.stats["successful_requests"] += 1
-                    self.stats["providers_used"]['portfolio-fallback'] = self.stats["providers_used"].get('portfolio-fallback', 0) + 1
+                    self.stats["providers_used"]['portfolio-fallback'] += 1
                     return ProviderResult(
                         success=True,
                         data=portfolio_df,
@@ -1337,20 +1484,282 @@ class MarketDataRouter:
         
         return ProviderResult(
             success=False,
-            error="all_providers_failed",
+            error=result.error,
             provider="none"
         )
     
+    async def _fetch_hedged(
+        self,
+        providers: List[BaseProvider],
+        ticker: str,
+        period: str,
+        interval: str,
+        min_rows: int,
+        hedge_delay: float = PROVIDER_HEDGE_DELAY,
+        deadline: float = PROVIDER_CHAIN_DEADLINE,
+        grace: float = PROVIDER_DEADLINE_GRACE,
+        hedge_quota_limited: bool = False
+    ) -> ProviderResult:
+        """
+        Walk the provider chain in order, hedging slow providers.
+        
+        A provider still running after hedge_delay seconds gets the next
+        provider started alongside it; a failure starts the next one at once.
+        Quota-limited providers are never started alongside a running fetch
+        unless hedge_quota_limited is set, so their part of the chain stays a
+        strict ordered walk; while one of them waits at the head of the queue,
+        hedging skips ahead to the next keyless provider instead. The first
+        usable result wins and the remaining
+        fetches are cancelled. A hedge_delay of 0 races all eligible providers.
+        
+        Fetches still running after deadline seconds are cancelled. Keyless
+        providers not yet tried then get grace more seconds, raced together;
+        if none of them succeeds the chain fails with error="deadline".
+        Otherwise a failed chain returns error="rate_limit" when any provider
+        was rate limited or skipped on cooldown, else "all_providers_failed".
+        """
+        loop = asyncio.get_running_loop()
+        expires_at = loop.time() + deadline
+        queue = deque(enumerate(providers, 1))
+        pending: Dict[asyncio.Future, BaseProvider] = {}
+        rate_limited = False
+        
+        def _upcoming() -> Optional[BaseProvider]:
+            nonlocal rate_limited
+            while queue:
+                provider = queue[0][1]
+                if not self._provider_on_cooldown(provider):
+                    return provider
+                logger.debug("[Router] Skipping %s for %s: cooldown active", provider.name, ticker)
+                rate_limited = True
+                queue.popleft()
+            return None
+        
+        def _next_position() -> Optional[int]:
+            """Queue position of the provider to start next, or None if none may start."""
+            if _upcoming() is None:
+                return None
+            if not pending or hedge_quota_limited:
+                return 0
+            for position, (_, provider) in enumerate(queue):
+                if (
+                    self._provider_key(provider) not in QUOTA_LIMITED_PROVIDERS
+                    and not self._provider_on_cooldown(provider)
+                ):
+                    return position
+            return None
+        
+        def _can_start_next() -> bool:
+            return _next_position() is not None
+        
+        def _start_next() -> None:
+            position = _next_position()
+            idx, provider = queue[position]
+            del queue[position]
+            logger.debug("[Router] Attempt %s: Trying %s for %s", idx, provider.name, ticker)
+            pending[asyncio.ensure_future(provider.fetch_ohlcv(ticker, period, interval))] = provider
+        
+        async def _cancel_pending() -> None:
+            for task in pending:
+                task.cancel()
+            # Let cancelled losers unwind so none are left unawaited
+            await asyncio.gather(*pending, return_exceptions=True)
+            pending.clear()
+        
+        timed_out = False
+        in_grace = False
+        if _can_start_next():
+            _start_next()
+        try:
+            while pending:
+                budget = expires_at - loop.time()
+                if budget <= 0:
+                    late = [
+                        entry for entry in queue
+                        if self._provider_key(entry[1]) not in QUOTA_LIMITED_PROVIDERS
+                        and not self._provider_on_cooldown(entry[1])
+                    ]
+                    logger.warning(
+                        f"[Router] Provider chain for {ticker} exceeded {deadline:.0f}s deadline, "
+                        f"cancelling {len(pending)} fetch(es)"
+                    )
+                    await _cancel_pending()
+                    timed_out = True
+                    if in_grace or not late:
+                        break
+                    # Give keyless providers that never got a turn one last race
+                    logger.info(f"[Router] Trying {len(late)} untried keyless provider(s) for {ticker}")
+                    in_grace = True
+                    queue.clear()
+                    queue.extend(late)
+                    while _can_start_next():
+                        _start_next()
+                    expires_at = loop.time() + grace
+                    continue
+                # A wait cut short by the deadline is handled at the top of the loop
+                can_hedge = _can_start_next() and hedge_delay < budget
+                done, _ = await asyncio.wait(
+                    pending,
+                    timeout=hedge_delay if can_hedge else budget,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if not done:
+                    if can_hedge:
+                        logger.debug("[Router] Slow provider for %s, hedging with next provider", ticker)
+                        _start_next()
+                    continue
+                
+                winner = None
+                for task in done:
+                    provider = pending.pop(task)
+                    if winner is None:
+                        winner = self._accept_provider_result(provider, task, ticker, period, interval, min_rows)
+                        # A rate-limited failure leaves the provider on cooldown
+                        rate_limited = rate_limited or (
+                            winner is None and self._provider_on_cooldown(provider)
+                        )
+                    elif not task.cancelled():
+                        task.exception()  # Finished alongside the winner; mark retrieved
+                if winner is not None:
+                    return winner
+                if _can_start_next():
+                    _start_next()
+        finally:
+            await _cancel_pending()
+        if timed_out:
+            error = "deadline"
+        elif rate_limited:
+            error = "rate_limit"
+        else:
+            error = "all_providers_failed"
+        return ProviderResult(success=False, error=error, provider="none")
+    
+    def _accept_provider_result(
+        self,
+        provider: BaseProvider,
+        task: asyncio.Future,
+        ticker: str,
+        period: str,
+        interval: str,
+        min_rows: int
+    ) -> Optional[ProviderResult]:
+        """Return a finished provider fetch if usable; otherwise record why it failed."""
+        try:
+            result = task.result()
+        except Exception as e:
+            error_type = type(e).__name__
+            self.stats["errors"][error_type] += 1
+            error_lower = str(e).lower()
+            if "429" in error_lower or "rate limit" in error_lower:
+                retry_after = _parse_retry_after_seconds(
+                    getattr(getattr(e, "response", None), "headers", {}).get("Retry-After")
+                    if getattr(e, "response", None) is not None
+                    else None
+                )
+                self._mark_provider_rate_limited_for(provider, retry_after)
+            logger.warning(f"[Router] {provider.name} raised {error_type}, trying next provider: {e}")
+            return None
+        
+        if result.success and result.data is not None and len(result.data) >= min_rows:
+            # Track success
+            self.stats["successful_requests"] += 1
+            provider_name = result.provider.split("-")[0]  # Remove "-cached" suffix if present
+            self.stats["providers_used"][provider_name] += 1
+            
+            # Enhanced logging showing which provider succeeded
+            if provider_name.lower() == "stooq":
+                logger.info(f"[Router] ✓ Fallback success: {ticker} from Stooq ({len(result.data)} rows after yfinance failed)")
+            else:
+                logger.info(f"[Router] ✓ Primary success: {ticker} from {result.provider} ({len(result.data)} rows)")
+            self.cache.set_ohlcv(
+                _router_cache_key(ticker, period, interval),
+                result.data,
+                ttl_seconds=_ohlcv_ttl_for_request(period, interval),
+            )
+            return result
+        
+        if result.error == "rate_limit":
+            logger.warning(f"[Router] {result.provider} rate limited, trying next provider...")
+            self._mark_provider_rate_limited_for(provider, result.retry_after_seconds)
+        elif result.error == "unsupported_interval":
+            logger.debug("[Router] %s doesn't support %s, trying next provider...", result.provider, interval)
+        return None
+    
+    def peek_ohlcv(
+        self,
+        ticker: str,
+        period: str = "1y",
+        interval: str = "1d",
+        min_rows: int = 30
+    ) -> Optional[pd.DataFrame]:
+        """Return router-cached OHLCV from RAM only (no SQLite, no providers)."""
+        cached = self.cache.get_memory(_router_cache_key(ticker, period, interval))
+        if cached is not None and len(cached) >= min_rows:
+            return cached
+        return None
+    
+    async def prefetch_ohlcv_many(
+        self,
+        tickers: List[str],
+        period: str = "1y",
+        interval: str = "1d",
+        min_rows: int = 30
+    ) -> Dict[str, pd.DataFrame]:
+        """
+        Resolve several tickers from the router cache, then fetch the misses with
+        one batched yfinance download.
+        
+        Cached tickers are read with a single bulk cache lookup. Returns every
+        ticker resolved here (cached or batch-fetched); the rest are left for the
+        per-ticker chain in get_ohlcv.
+        """
+        ttl = _ohlcv_ttl_for_request(period, interval)
+        keys = {ticker: _router_cache_key(ticker, period, interval) for ticker in dict.fromkeys(tickers)}
+        cached = self.cache.get_ohlcv_many(list(keys.values()), ttl_seconds=ttl)
+        
+        resolved: Dict[str, pd.DataFrame] = {}
+        misses = []
+        for ticker, key in keys.items():
+            df = cached.get(key)
+            if df is not None and len(df) >= min_rows:
+                resolved[ticker] = df
+            else:
+                misses.append(ticker)
+        
+        yf_provider = next((p for p in self.providers if isinstance(p, ProviderYFinance)), None)
+        if len(misses) < 2 or yf_provider is None or self._provider_on_cooldown(yf_provider):
+            return resolved
+        
+        try:
+            frames = await yf_provider.fetch_ohlcv_many(misses, period, interval)
+        except Exception as e:
+            error_lower = str(e).lower()
+            if "429" in error_lower or "rate limit" in error_lower:
+                self._mark_provider_rate_limited(yf_provider)
+            logger.warning(f"[Router] Batch yfinance prefetch failed for {len(misses)} tickers: {e}")
+            return resolved
+        
+        fetched = 0
+        for ticker, df in frames.items():
+            if len(df) >= min_rows:
+                self.cache.set_ohlcv(keys[ticker], df, ttl_seconds=ttl)
+                resolved[ticker] = df
+                fetched += 1
+        logger.info(f"[Router] Batch prefetch: {fetched}/{len(misses)} tickers from yfinance")
+        return resolved
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get router statistics for monitoring."""
         total = self.stats["total_requests"]
         success_rate = (self.stats["successful_requests"] / total * 100) if total > 0 else 0
         return {
             **self.stats,
+            "providers_used": dict(self.stats["providers_used"]),
+            "errors": dict(self.stats["errors"]),
             "success_rate_percent": round(success_rate, 2)
         }
     
-    def get_etf_facts(self, ticker: str) -> Optional[Dict[str, Any]]:
+    def get_etf_facts(self, ticker: str) -> Optional[Mapping[str, Any]]:
         """Get ETF facts (non-async, uses cache)."""
         return self.etf_provider.get_facts(ticker)
 
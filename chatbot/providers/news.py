@@ -13,6 +13,7 @@ import yfinance as yf
 
 from ..cache import CacheInterface
 from ..config import Config
+from .market_router import _YF_EXECUTOR, _YF_SESSION
 
 logger = logging.getLogger(__name__)
 
@@ -105,13 +106,13 @@ class NewsProvider:
         return result
     
     async def _fetch_yfinance_news(self, ticker: str) -> List[Dict]:
-        """Fetch news from yfinance (runs in thread pool)."""
+        """Fetch news from yfinance (runs in the shared yfinance thread pool)."""
         
         def _get_news():
-            return yf.Ticker(ticker).news or []
+            return yf.Ticker(ticker, session=_YF_SESSION).news or []
         
-        loop = asyncio.get_event_loop()
-        return await loop.run_in_executor(None, _get_news)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_YF_EXECUTOR, _get_news)
     
     async def _fetch_yahoo_rss(self, ticker: str, limit: int = 5) -> List[Dict[str, str]]:
         """Fetch news from Yahoo Finance RSS feed."""
@@ -21,6 +21,7 @@ class RateLimiter:
     - On each request: check if tokens available, wait if needed
     - Also check per-second cap: max RPS tokens per second
     - Track 429 errors and implement backoff
+    - Honor server cooldowns (Retry-After) for every caller, not just the retrying one
     
     Attributes:
         rpm: Requests per minute limit
@@ -43,8 +44,10 @@ class RateLimiter:
             raise ValueError("rpm and rps must be positive")
         if rps > rpm // 60:
             logger.warning(
-                f"RPS ({rps}) is high relative to RPM ({rpm}), "
-                f"consider rps <= {rpm // 60}"
+                "RPS (%d) is high relative to RPM (%d), consider rps <= %d",
+                rps,
+                rpm,
+                rpm // 60,
             )
         
         self.rpm = rpm
@@ -67,6 +70,9 @@ class RateLimiter:
         self.error_429_count = 0
         self.last_reset_ts = time.monotonic()
         
+        # Server-imposed pause (e.g. 429 Retry-After), shared by all callers
+        self.cooldown_until = 0.0
+        
         # Lazy lock init: creating asyncio.Lock() without an event loop breaks sync tests.
         self.lock = None
 
@@ -87,6 +93,13 @@ class RateLimiter:
             True if token acquired, False if not available and wait=False
         """
         async with self._get_lock():
+            cooldown_remaining = self.cooldown_until - time.monotonic()
+            if cooldown_remaining > 0:
+                if not wait:
+                    return False
+                logger.debug("Provider cooldown active. Waiting %.2fs...", cooldown_remaining)
+                await asyncio.sleep(cooldown_remaining)
+            
             self._refill_tokens()
             
             # Check if we have tokens available (both per-minute and per-second)
@@ -96,7 +109,7 @@ class RateLimiter:
                 
                 # Calculate wait time
                 wait_time = self._calculate_wait_time()
-                logger.debug(f"Rate limit reached. Waiting {wait_time:.2f}s...")
+                logger.debug("Rate limit reached. Waiting %.2fs...", wait_time)
                 await asyncio.sleep(wait_time)
                 self._refill_tokens()
             
@@ -106,9 +119,10 @@ class RateLimiter:
             self.requests_last_minute += 1
             
             logger.debug(
-                f"Token acquired. Remaining: {self.current_tokens:.2f}/min, "
-                f"{self.current_tokens_per_second:.2f}/sec, "
-                f"Requests in window: {self.requests_last_minute}"
+                "Token acquired. Remaining: %.2f/min, %.2f/sec, Requests in window: %d",
+                self.current_tokens,
+                self.current_tokens_per_second,
+                self.requests_last_minute,
             )
             
             return True
@@ -138,7 +152,8 @@ class RateLimiter:
         # Reset minute counter if 1+ minute has passed
         if now - self.last_reset_ts >= 60:
             logger.info(
-                f"Minute window reset. Requests in previous window: {self.requests_last_minute}"
+                "Minute window reset. Requests in previous window: %d",
+                self.requests_last_minute,
             )
             self.requests_last_minute = 0
             self.last_reset_ts = now
@@ -159,12 +174,22 @@ class RateLimiter:
     def record_429(self) -> None:
         """Record a 429 (rate limit) error from API."""
         self.error_429_count += 1
-        logger.warning(f"API returned 429. Error count: {self.error_429_count}")
+        logger.warning("API returned 429. Error count: %d", self.error_429_count)
+
+    def set_cooldown(self, seconds: float) -> None:
+        """
+        Block all acquires for `seconds` (e.g. from a 429 Retry-After header).
+        
+        Never shortens an already active cooldown.
+        """
+        if seconds <= 0:
+            return
+        self.cooldown_until = max(self.cooldown_until, time.monotonic() + seconds)
 
     def reset_429_count(self) -> None:
         """Reset 429 error counter on successful request."""
         if self.error_429_count > 0:
-            logger.info(f"Cleared 429 error count (was {self.error_429_count})")
+            logger.info("Cleared 429 error count (was %d)", self.error_429_count)
         self.error_429_count = 0
 
     def get_backoff_time(self) -> float:
@@ -199,7 +224,7 @@ class RateLimiter:
         if backoff == 0:
             return False
         
-        logger.warning(f"Backing off for {backoff:.1f}s due to rate limit...")
+        logger.warning("Backing off for %.1fs due to rate limit...", backoff)
         await asyncio.sleep(backoff)
         return True
 
@@ -212,6 +237,9 @@ class RateLimiter:
             "current_tokens_per_second": round(self.current_tokens_per_second, 2),
             "requests_in_current_minute": self.requests_last_minute,
             "consecutive_429_errors": self.error_429_count,
+            "cooldown_remaining_seconds": round(
+                max(0.0, self.cooldown_until - time.monotonic()), 2
+            ),
         }
 
 
@@ -3,6 +3,7 @@
 import asyncio
 import json
 import logging
+import random
 from typing import Dict, List, Optional
 
 import httpx
@@ -13,6 +14,19 @@ from ..db import PortfolioDB
 
 logger = logging.getLogger(__name__)
 
+# Only transient failures are retried; anything else (bad CIK, 4xx) fails fast.
+RETRYABLE_ERRORS = (httpx.TransportError, json.JSONDecodeError)
+MAX_RETRY_BACKOFF_SECONDS = 30.0
+RETRY_JITTER_SECONDS = 0.5
+
+
+def _is_retryable(exc: Exception) -> bool:
+    """Return True for timeouts, connection errors, bad JSON, 429 and 5xx."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        status = exc.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(exc, RETRYABLE_ERRORS) or "429" in str(exc)
+
 
 class SECEdgarProvider:
     """
@@ -147,31 +161,34 @@ class SECEdgarProvider:
                 if exc.response.status_code == 404:
                     logger.warning("No company facts found for CIK %s (404)", cik)
                     return None
-                elif attempt < self.config.max_retries - 1:
-                    backoff = self.config.retry_backoff_factor * (2 ** attempt)
-                    logger.warning(
-                        "HTTP error on attempt %d for CIK %s: %s, retrying in %.1fs...",
-                        attempt + 1, cik, exc, backoff
-                    )
-                    await asyncio.sleep(backoff)
-                else:
+                if not _is_retryable(exc) or attempt >= self.config.max_retries - 1:
                     logger.warning("HTTP error on final attempt for CIK %s: %s", cik, exc)
                     return None
+                backoff = self._retry_backoff(attempt)
+                logger.warning(
+                    "HTTP error on attempt %d for CIK %s: %s, retrying in %.1fs...",
+                    attempt + 1, cik, exc, backoff
+                )
+                await asyncio.sleep(backoff)
             
             except Exception as exc:
-                if attempt < self.config.max_retries - 1:
-                    backoff = self.config.retry_backoff_factor * (2 ** attempt)
-                    logger.warning(
-                        "Error on attempt %d for CIK %s: %s, retrying in %.1fs...",
-                        attempt + 1, cik, exc, backoff
-                    )
-                    await asyncio.sleep(backoff)
-                else:
+                if not _is_retryable(exc) or attempt >= self.config.max_retries - 1:
                     logger.warning("Failed to get company facts for CIK %s: %s", cik, exc)
                     return None
+                backoff = self._retry_backoff(attempt)
+                logger.warning(
+                    "Error on attempt %d for CIK %s: %s, retrying in %.1fs...",
+                    attempt + 1, cik, exc, backoff
+                )
+                await asyncio.sleep(backoff)
         
         return None
     
+    def _retry_backoff(self, attempt: int) -> float:
+        """Exponential backoff clamped to MAX_RETRY_BACKOFF_SECONDS, plus jitter."""
+        backoff = min(MAX_RETRY_BACKOFF_SECONDS, self.config.retry_backoff_factor * (2 ** attempt))
+        return backoff + random.uniform(0, RETRY_JITTER_SECONDS)
+    
     def extract_fundamentals(self, facts: Dict) -> Dict[str, List[Dict]]:
         """
         Extract fundamental metrics from SEC EDGAR facts data.
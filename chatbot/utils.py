@@ -1,10 +1,16 @@
 """Utility functions for data processing and formatting."""
 
+import json
 import logging
 import re
 from dataclasses import dataclass
 from decimal import Decimal, ROUND_HALF_UP
-from typing import List, Optional
+from typing import Any, List, Optional, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +35,13 @@ def safe_float(value: Optional[str]) -> Optional[float]:
         return None
 
 
+def loads_json(payload: Union[bytes, str]) -> Any:
+    """Decode a JSON payload, using orjson when installed (stdlib json otherwise)."""
+    if orjson is not None:
+        return orjson.loads(payload)
+    return json.loads(payload)
+
+
 def parse_portfolio_text(text: str) -> List[Position]:
     """
     Parse portfolio text into list of positions.
@@ -1,5 +1,6 @@
 """Web API for Telegram bot - FastAPI application with REST endpoints and web UI."""
 
+import asyncio
 import logging
 import os
 import re
@@ -148,7 +149,10 @@ async def api_chat(
             # Quick/fast analysis
             if "fast" in action:
                 try:
-                    df, reason = await _stock_snapshot(ticker)
+                    # Price snapshot and news are independent; fetch them concurrently
+                    (df, reason), news = await asyncio.gather(
+                        _stock_snapshot(ticker), _ticker_news(ticker)
+                    )
                     if df is None:
                         error_msg = "Failed to load data"
                         if reason == "rate_limit":
@@ -162,7 +166,6 @@ async def api_chat(
                     from ..analytics import compute_buy_window, format_buy_window_block
                     buy_window = compute_buy_window(df)
                     buy_window_text = format_buy_window_block(buy_window)
-                    news = await _ticker_news(ticker)
 
                     last = df.iloc[-1]
                     prev = df.iloc[-2]
@@ -216,7 +219,10 @@ async def api_chat(
             # Detailed analysis (quick + quality), keep buffett/quality aliases for backward compatibility.
             elif "detail" in action or "buffett" in action or "quality" in action:
                 try:
-                    df, reason = await _stock_snapshot(ticker)
+                    # Price snapshot and news are independent; fetch them concurrently
+                    (df, reason), news = await asyncio.gather(
+                        _stock_snapshot(ticker), _ticker_news(ticker)
+                    )
                     if df is None:
                         error_msg = "Failed to load data"
                         if reason == "rate_limit":
@@ -252,7 +258,6 @@ async def api_chat(
                         technical = _stock_analysis_text(ticker, df)
                         quality_text = f"💎 Quality analysis {ticker}\n\n{technical}"
 
-                    news = await _ticker_news(ticker)
                     ai_analysis = await _ai_news_analysis(ticker, quality_text, news)
 
                     response_text = (
@@ -74,6 +74,24 @@ class TestRateLimiter(unittest.TestCase):
         limiter.record_429()
         self.assertEqual(limiter.get_backoff_time(), 0)
 
+    def test_cooldown_blocks_non_waiting_acquire(self):
+        """Test set_cooldown makes acquire fail fast while active."""
+        limiter = RateLimiter(rpm=60, rps=5)
+        limiter.set_cooldown(30)
+        
+        self.assertFalse(asyncio.run(limiter.acquire(wait=False)))
+        self.assertGreater(limiter.get_stats()["cooldown_remaining_seconds"], 29)
+    
+    def test_cooldown_never_shortened(self):
+        """Test a shorter Retry-After does not shrink an active cooldown."""
+        limiter = RateLimiter(rpm=60, rps=5)
+        limiter.set_cooldown(30)
+        until = limiter.cooldown_until
+        
+        limiter.set_cooldown(1)
+        self.assertEqual(limiter.cooldown_until, until)
+
+
 
 class TestDataCache(unittest.TestCase):
     """Test data caching with TTL - SKIPPED due to in-memory DB initialization issues."""
@@ -1,10 +1,12 @@
 """Unit tests for MarketDataProvider batch loading."""
 
 import unittest
+from datetime import datetime, timedelta
 from unittest.mock import Mock, AsyncMock, patch
 import pandas as pd
 
 from chatbot.providers.market import MarketDataProvider
+from chatbot.providers.market_router import ProviderResult
 from chatbot.cache import InMemoryCache
 from chatbot.config import Config
 
@@ -45,6 +47,7 @@ class TestMarketBatchLoading(unittest.TestCase):
             return test_df, None
         
         provider.get_price_history = AsyncMock(side_effect=mock_get_price_history)
+        provider.router.prefetch_ohlcv_many = AsyncMock(return_value={})
         
         # Execute batch fetch
         result = await provider.get_prices_many(tickers, period="1y", interval="1d")
@@ -82,6 +85,7 @@ class TestMarketBatchLoading(unittest.TestCase):
             return test_df, None
         
         provider.get_price_history = AsyncMock(side_effect=mock_get_price_history)
+        provider.router.prefetch_ohlcv_many = AsyncMock(return_value={})
         
         result = await provider.get_prices_many(tickers)
         
@@ -92,8 +96,94 @@ class TestMarketBatchLoading(unittest.TestCase):
         # Invalid ticker should be None
         self.assertIsNone(result.get("INVALID"))
     
+    async def test_get_prices_many_bounds_fan_out(self):
+        """Test that at most batch_concurrency fetches run at once."""
+        import asyncio
+
+        self.config.batch_concurrency = 2
+        provider = MarketDataProvider(
+            config=self.config,
+            cache=self.cache,
+            http_client=self.http_client,
+            semaphore=self.semaphore
+        )
+
+        live = 0
+        peak = 0
+
+        async def mock_get_price_history(ticker, period, interval, min_rows):
+            nonlocal live, peak
+            live += 1
+            peak = max(peak, live)
+            await asyncio.sleep(0.01)
+            live -= 1
+            if ticker == "BAD":
+                raise RuntimeError("boom")
+            return pd.DataFrame({'Close': [100] * 30}), None
+
+        provider.get_price_history = AsyncMock(side_effect=mock_get_price_history)
+        provider.router.prefetch_ohlcv_many = AsyncMock(return_value={})
+
+        tickers = ["AAPL", "BAD", "MSFT", "GOOGL", "NVDA"]
+        result = await provider.get_prices_many(tickers)
+
+        self.assertEqual(peak, 2)
+        self.assertEqual(list(result), tickers)
+        self.assertIsNone(result["BAD"])
+        self.assertEqual(sum(df is not None for df in result.values()), 4)
+
+    async def test_batch_prefetch_warms_router_cache(self):
+        """Test that one batched yfinance download serves all cache misses."""
+        from chatbot.providers.market_router import ProviderYFinance
+        
+        provider = MarketDataProvider(
+            config=self.config,
+            cache=self.cache,
+            http_client=self.http_client,
+            semaphore=self.semaphore
+        )
+        
+        test_df = pd.DataFrame(
+            {col: [100.0] * 30 for col in ["Open", "High", "Low", "Close", "Volume"]},
+            index=pd.date_range("2024-01-01", periods=30, name="Date"),
+        )
+        yf_provider = next(p for p in provider.router.providers if isinstance(p, ProviderYFinance))
+        yf_provider.fetch_ohlcv_many = AsyncMock(return_value={"AAPL": test_df, "MSFT": test_df})
+        
+        dummy = Mock()
+        dummy.name = "dummy"
+        dummy.fetch_ohlcv = AsyncMock(return_value=ProviderResult(success=False, error="failed"))
+        provider.router.providers = [dummy, yf_provider]
+        
+        result = await provider.get_prices_many(["AAPL", "MSFT", "NOPE"], period="1y", interval="1d")
+        
+        yf_provider.fetch_ohlcv_many.assert_awaited_once_with(["AAPL", "MSFT", "NOPE"], "1y", "1d")
+        self.assertEqual(len(result["AAPL"]), 30)
+        self.assertEqual(len(result["MSFT"]), 30)
+        # Only the ticker missing from the batch goes through the per-ticker chain
+        self.assertEqual([c.args[0] for c in dummy.fetch_ohlcv.call_args_list], ["NOPE"])
+    
+    async def test_providers_share_injected_data_cache(self):
+        """Test that a pre-built DataCache is reused instead of opening another."""
+        first = MarketDataProvider(
+            config=self.config,
+            cache=self.cache,
+            http_client=self.http_client,
+            semaphore=self.semaphore
+        )
+        second = MarketDataProvider(
+            config=self.config,
+            cache=self.cache,
+            http_client=self.http_client,
+            semaphore=self.semaphore,
+            data_cache=first.data_cache
+        )
+        
+        self.assertIs(second.data_cache, first.data_cache)
+        self.assertIs(second.router.cache, first.data_cache)
+    
     async def test_cache_hit_avoids_network(self):
-        """Test that cached prices avoid network calls."""
+        """Test that router-cached prices avoid provider calls."""
         provider = MarketDataProvider(
             config=self.config,
             cache=self.cache,
@@ -101,14 +191,17 @@ class TestMarketBatchLoading(unittest.TestCase):
             semaphore=self.semaphore
         )
         
-        # Pre-populate cache
+        # Pre-populate the router's DataCache (RAM layer)
         test_df = pd.DataFrame({'Close': [100] * 30})
-        cache_key = "market:AAPL:1y:1d"
-        self.cache.set(cache_key, (test_df, None))
+        provider.router.cache.mem_cache["router:AAPL:1y:1d"] = (
+            test_df, datetime.now() + timedelta(minutes=5)
+        )
         
-        # Mock router to track if it was called
-        provider.router = Mock()
-        provider.router.get_ohlcv = AsyncMock()
+        # Mock providers to track if any were called
+        dummy = Mock()
+        dummy.name = "dummy"
+        dummy.fetch_ohlcv = AsyncMock()
+        provider.router.providers = [dummy]
         
         # Fetch with cached data
         result, err = await provider.get_price_history("AAPL", "1y", "1d")
@@ -117,8 +210,281 @@ class TestMarketBatchLoading(unittest.TestCase):
         self.assertIsNotNone(result)
         self.assertIsNone(err)
         
-        # Router should NOT be called
+        # Provider chain should NOT be called
+        dummy.fetch_ohlcv.assert_not_called()
+    
+    async def test_ram_hit_skips_router(self):
+        """Test that a RAM-cached frame is served without entering the router."""
+        provider = MarketDataProvider(
+            config=self.config,
+            cache=self.cache,
+            http_client=self.http_client,
+            semaphore=self.semaphore
+        )
+        
+        test_df = pd.DataFrame({'Close': [100] * 30})
+        provider.router.cache.mem_cache["router:AAPL:1y:1d"] = (
+            test_df, datetime.now() + timedelta(minutes=5)
+        )
+        provider.router.get_ohlcv = AsyncMock()
+        
+        result, err = await provider.get_price_history("AAPL", "1y", "1d")
+        
+        self.assertIs(result, test_df)
+        self.assertIsNone(err)
         provider.router.get_ohlcv.assert_not_called()
+    
+    async def test_legacy_cache_not_consulted_for_ohlcv(self):
+        """Test that price history is served by the router, not the legacy cache."""
+        provider = MarketDataProvider(
+            config=self.config,
+            cache=self.cache,
+            http_client=self.http_client,
+            semaphore=self.semaphore
+        )
+        
+        test_df = pd.DataFrame({'Close': [100] * 30})
+        provider.router = Mock()
+        provider.router.peek_ohlcv.return_value = None
+        provider.router.get_ohlcv = AsyncMock(
+            return_value=ProviderResult(success=True, data=test_df, provider="p1")
+        )
+        
+        result, err = await provider.get_price_history("AAPL", "1y", "1d")
+        
+        self.assertIs(result, test_df)
+        self.assertIsNone(err)
+        self.assertEqual(self.cache.stats()["size"], 0)
+
+    async def test_concurrent_duplicate_requests_share_one_fetch(self):
+        """Test that concurrent calls for the same key hit the router once."""
+        import asyncio
+        
+        provider = MarketDataProvider(
+            config=self.config,
+            cache=self.cache,
+            http_client=self.http_client,
+            semaphore=self.semaphore
+        )
+        
+        test_df = pd.DataFrame({'Close': [100] * 30})
+        
+        async def slow_get_ohlcv(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return ProviderResult(success=True, data=test_df, provider="p1")
+        
+        provider.router = Mock()
+        provider.router.peek_ohlcv.return_value = None
+        provider.router.get_ohlcv = AsyncMock(side_effect=slow_get_ohlcv)
+        
+        results = await asyncio.gather(
+            provider.get_price_history("AAPL", "1y", "1d"),
+            provider.get_price_history("AAPL", "1y", "1d"),
+            provider.get_price_history("MSFT", "1y", "1d"),
+        )
+        
+        self.assertEqual(provider.router.get_ohlcv.call_count, 2)
+        self.assertIs(results[0][0], results[1][0])
+        self.assertEqual(provider._inflight, {})
+    
+    async def test_inflight_failure_propagates_to_all_waiters(self):
+        """Test that an exception in the shared fetch reaches every waiter."""
+        import asyncio
+        
+        provider = MarketDataProvider(
+            config=self.config,
+            cache=self.cache,
+            http_client=self.http_client,
+            semaphore=self.semaphore
+        )
+        
+        async def failing_get_ohlcv(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            raise RuntimeError("boom")
+        
+        provider.router = Mock()
+        provider.router.peek_ohlcv.return_value = None
+        provider.router.get_ohlcv = AsyncMock(side_effect=failing_get_ohlcv)
+        
+        results = await asyncio.gather(
+            provider.get_price_history("AAPL", "1y", "1d"),
+            provider.get_price_history("AAPL", "1y", "1d"),
+            return_exceptions=True,
+        )
+        
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+        self.assertEqual(provider.router.get_ohlcv.call_count, 1)
+        self.assertEqual(provider._inflight, {})
+
+    async def test_close_only_closes_own_data_cache(self):
+        """Test that close() leaves a caller-supplied DataCache open."""
+        shared = Mock()
+        provider = MarketDataProvider(
+            config=self.config,
+            cache=self.cache,
+            http_client=self.http_client,
+            semaphore=self.semaphore,
+            data_cache=shared,
+        )
+        provider.close()
+        shared.close.assert_not_called()
+
+        provider = MarketDataProvider(
+            config=self.config,
+            cache=self.cache,
+            http_client=self.http_client,
+            semaphore=self.semaphore,
+        )
+        with patch.object(provider.data_cache, "close", wraps=provider.data_cache.close) as close:
+            provider.close()
+        close.assert_called_once_with()
+
+    async def test_cancelled_leader_lets_joiner_refetch(self):
+        """Test that cancelling the leading caller does not cancel its joiners."""
+        import asyncio
+
+        provider = MarketDataProvider(
+            config=self.config,
+            cache=self.cache,
+            http_client=self.http_client,
+            semaphore=self.semaphore
+        )
+
+        test_df = pd.DataFrame({'Close': [100] * 30})
+
+        async def slow_get_ohlcv(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return ProviderResult(success=True, data=test_df, provider="p1")
+
+        provider.router = Mock()
+        provider.router.peek_ohlcv.return_value = None
+        provider.router.get_ohlcv = AsyncMock(side_effect=slow_get_ohlcv)
+
+        leader = asyncio.create_task(provider.get_price_history("AAPL", "1y", "1d"))
+        await asyncio.sleep(0)
+        joiner = asyncio.create_task(provider.get_price_history("AAPL", "1y", "1d"))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        df, err = await joiner
+
+        self.assertTrue(leader.cancelled())
+        self.assertIs(df, test_df)
+        self.assertIsNone(err)
+        self.assertEqual(provider.router.get_ohlcv.call_count, 2)
+        self.assertEqual(provider._inflight, {})
+
+    async def test_failed_ticker_is_negatively_cached(self):
+        """Test that a dead ticker skips the router until the negative entry expires."""
+        provider = MarketDataProvider(
+            config=self.config,
+            cache=self.cache,
+            http_client=self.http_client,
+            semaphore=self.semaphore
+        )
+
+        provider.router = Mock()
+        provider.router.peek_ohlcv.return_value = None
+        provider.router.get_ohlcv = AsyncMock(
+            return_value=ProviderResult(success=False, error="all_providers_failed")
+        )
+
+        first = await provider.get_price_history("DEAD", "1y", "1d")
+        second = await provider.get_price_history("DEAD", "1y", "1d")
+
+        self.assertEqual(first, (None, "all_providers_failed"))
+        self.assertEqual(second, (None, "all_providers_failed"))
+        self.assertEqual(provider.router.get_ohlcv.call_count, 1)
+
+    def _provider_with_stub_chain(self, *results):
+        """MarketDataProvider whose real router walks stub providers returning results."""
+        import shutil
+        import tempfile
+        from pathlib import Path
+        from chatbot.providers.cache_v2 import DataCache
+
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, True)
+        data_cache = DataCache(str(Path(temp_dir) / "market_cache.db"))
+        self.addCleanup(data_cache.close)
+        provider = MarketDataProvider(
+            config=self.config,
+            cache=self.cache,
+            http_client=self.http_client,
+            semaphore=self.semaphore,
+            data_cache=data_cache,
+        )
+        stubs = []
+        for i, result in enumerate(results):
+            stub = Mock()
+            stub.name = f"stub{i}"
+            stub.fetch_ohlcv = AsyncMock(return_value=result)
+            stubs.append(stub)
+        provider.router.providers = stubs
+        provider.router.portfolio_prices = {}
+        return provider, stubs
+
+    async def test_rate_limit_failure_not_negatively_cached(self):
+        """Test that a chain failing on a rate limit is retried on the next call."""
+        provider, (limited, empty) = self._provider_with_stub_chain(
+            ProviderResult(success=False, error="rate_limit", provider="stub0"),
+            ProviderResult(success=False, error="no_data", provider="stub1"),
+        )
+
+        first = await provider.get_price_history("ZZZZ", "1y", "1d")
+        second = await provider.get_price_history("ZZZZ", "1y", "1d")
+
+        self.assertEqual(first, (None, "rate_limit"))
+        # Not negatively cached: the router ran again (the limited stub is on cooldown)
+        self.assertEqual(second, (None, "rate_limit"))
+        self.assertEqual(limited.fetch_ohlcv.call_count, 1)
+        self.assertEqual(empty.fetch_ohlcv.call_count, 2)
+
+    async def test_definitive_miss_negatively_cached_through_router(self):
+        """Test that a chain where every provider has no data is negatively cached."""
+        provider, (first_stub, second_stub) = self._provider_with_stub_chain(
+            ProviderResult(success=False, error="no_data", provider="stub0"),
+            ProviderResult(success=False, error="no_data", provider="stub1"),
+        )
+
+        first = await provider.get_price_history("ZZZZ", "1y", "1d")
+        second = await provider.get_price_history("ZZZZ", "1y", "1d")
+
+        self.assertEqual(first, (None, "all_providers_failed"))
+        self.assertEqual(second, (None, "all_providers_failed"))
+        self.assertEqual(first_stub.fetch_ohlcv.call_count, 1)
+        self.assertEqual(second_stub.fetch_ohlcv.call_count, 1)
+
+    async def test_concurrent_fx_lookups_share_one_request(self):
+        """Test that concurrent FX lookups for one base currency issue one GET."""
+        import asyncio
+
+        provider = MarketDataProvider(
+            config=self.config,
+            cache=self.cache,
+            http_client=self.http_client,
+            semaphore=self.semaphore
+        )
+
+        response = Mock()
+        response.content = b'{"rates": {"USD": 1.25, "EUR": 1.17}}'
+
+        async def slow_get(*args, **kwargs):
+            await asyncio.sleep(0.01)
+            return response
+
+        self.http_client.get = AsyncMock(side_effect=slow_get)
+
+        results = await asyncio.gather(
+            provider.get_fx_rate("GBP", "USD"),
+            provider.get_fx_rate("GBP", "USD"),
+            provider.get_fx_rate("gbp", "EUR"),
+        )
+
+        self.assertEqual(self.http_client.get.call_count, 1)
+        self.assertEqual([r[0] for r in results], [1.25, 1.25, 1.17])
+        self.assertEqual(provider._fx_inflight, {})
+
 
 
 # Run tests with asyncio support
@@ -80,6 +80,18 @@ class TestStooqCSVParsing(unittest.TestCase):
         self.assertListEqual(list(df.columns), ['Open', 'High', 'Low', 'Close', 'Volume'])
         self.assertIsInstance(df.index, pd.DatetimeIndex)
     
+    def test_bytes_payload_parsing(self):
+        """Raw response bytes should parse without decoding first."""
+        csv_bytes = b"""Date,Open,High,Low,Close,Volume
+2024-01-03,188.15,190.03,186.94,187.12,2676990000
+2024-01-02,183.51,189.95,183.43,188.23,3201206000"""
+
+        df = self.provider._parse_stooq_csv(csv_bytes, "AAPL")
+
+        self.assertIsNotNone(df)
+        self.assertEqual(len(df), 2)
+        self.assertEqual(df.index[0], pd.Timestamp("2024-01-02"))
+
     def test_csv_with_whitespace(self):
         """CSV with extra whitespace should parse correctly."""
         csv_text = """  Date  , Open , High , Low , Close , Volume  
@@ -123,6 +135,31 @@ class TestStooqCSVParsing(unittest.TestCase):
         
         self.assertIsNotNone(df)
         self.assertEqual(len(df), 2)  # NaN row dropped
+    
+    def test_csv_missing_volume_keeps_bar(self):
+        """Bars with a close but no volume should be kept."""
+        csv_text = """Date,Open,High,Low,Close,Volume
+2024-01-02,183.51,189.95,183.43,188.23,
+2024-01-03,188.15,190.03,186.94,187.12,2676990000"""
+        
+        df = self.provider._parse_stooq_csv(csv_text, "AAPL")
+        
+        self.assertIsNotNone(df)
+        self.assertEqual(len(df), 2)
+        self.assertTrue(df["Close"].notna().all())
+    
+    def test_csv_non_numeric_cell_coerced(self):
+        """Non-numeric cells should become NaN instead of failing the parse."""
+        csv_text = """Date,Open,High,Low,Close,Volume
+2024-01-02,183.51,189.95,183.43,188.23,N/D
+2024-01-03,188.15,190.03,186.94,187.12,2676990000"""
+        
+        df = self.provider._parse_stooq_csv(csv_text, "AAPL")
+        
+        self.assertIsNotNone(df)
+        self.assertEqual(len(df), 2)
+        self.assertTrue(df["Volume"].isna().iloc[0])
+        self.assertEqual(df["Close"].dtype, "float64")
 
 
 class TestStooqFetchDaily(unittest.IsolatedAsyncioTestCase):
@@ -144,7 +181,7 @@ class TestStooqFetchDaily(unittest.IsolatedAsyncioTestCase):
         
         mock_response = AsyncMock()
         mock_response.status_code = 200
-        mock_response.text = csv_response
+        mock_response.content = csv_response.encode()
         self.mock_client.get.return_value = mock_response
         
         result = await self.provider.fetch_daily("AAPL", "1y")
@@ -158,7 +195,7 @@ class TestStooqFetchDaily(unittest.IsolatedAsyncioTestCase):
         """Empty response should return error."""
         mock_response = AsyncMock()
         mock_response.status_code = 200
-        mock_response.text = ""
+        mock_response.content = b""
         self.mock_client.get.return_value = mock_response
         
         result = await self.provider.fetch_daily("INVALID_TICKER", "1y")
@@ -221,7 +258,7 @@ class TestStooqFetchDaily(unittest.IsolatedAsyncioTestCase):
         
         mock_response = AsyncMock()
         mock_response.status_code = 200
-        mock_response.text = csv_response
+        mock_response.content = csv_response.encode()
         self.mock_client.get.return_value = mock_response
         
         result = await self.provider.fetch_daily("SPARSE_TICKER", "1y")
@@ -239,7 +276,7 @@ class TestStooqFetchDaily(unittest.IsolatedAsyncioTestCase):
         
         mock_response = AsyncMock()
         mock_response.status_code = 200
-        mock_response.text = csv_response
+        mock_response.content = csv_response.encode()
         self.mock_client.get.return_value = mock_response
         
         await self.provider.fetch_daily("AAPL", "1y")
@@ -248,6 +285,57 @@ class TestStooqFetchDaily(unittest.IsolatedAsyncioTestCase):
         called_url = self.mock_client.get.call_args[0][0]
         self.assertIn("AAPL.US", called_url)
 
+    async def test_rate_limiter_acquired_per_request(self):
+        """Each Stooq request should take a token from the shared limiter."""
+        csv_response = ("Date,Open,High,Low,Close,Volume\n" +
+                       "\n".join([
+                           f"2024-01-{2+i:02d},185.00,190.00,183.00,188.00,2500000000"
+                           for i in range(30)
+                       ]))
+        mock_response = Mock()
+        mock_response.status_code = 200
+        mock_response.content = csv_response.encode()
+        self.mock_client.get.return_value = mock_response
+        limiter = Mock()
+        limiter.acquire = AsyncMock(return_value=True)
+        provider = StooqFallbackProvider(self.mock_client, rate_limiter=limiter)
+        
+        await provider.fetch_daily("AAPL", "1y")
+        await provider.fetch_daily("MSFT", "1y")
+        
+        self.assertEqual(limiter.acquire.await_count, 2)
+    
+    async def test_semaphore_bounds_concurrent_requests(self):
+        """Concurrent fetches should never exceed the shared semaphore."""
+        import asyncio
+        
+        csv_response = ("Date,Open,High,Low,Close,Volume\n" +
+                       "\n".join([
+                           f"2024-01-{2+i:02d},185.00,190.00,183.00,188.00,2500000000"
+                           for i in range(30)
+                       ]))
+        in_flight = 0
+        peak = 0
+        
+        async def _get(*args, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            response = Mock()
+            response.status_code = 200
+            response.content = csv_response.encode()
+            return response
+        
+        self.mock_client.get.side_effect = _get
+        provider = StooqFallbackProvider(self.mock_client, semaphore=asyncio.Semaphore(2))
+        
+        results = await asyncio.gather(*(provider.fetch_daily(t, "1y") for t in ["A", "B", "C", "D", "E"]))
+        
+        self.assertTrue(all(r.success for r in results))
+        self.assertEqual(peak, 2)
+
 
 class TestLoadMarketDataStooqDaily(unittest.IsolatedAsyncioTestCase):
     """Test public load_market_data_stooq_daily function."""
@@ -266,7 +354,7 @@ class TestLoadMarketDataStooqDaily(unittest.IsolatedAsyncioTestCase):
         
         mock_response = AsyncMock()
         mock_response.status_code = 200
-        mock_response.text = csv_data
+        mock_response.content = csv_data.encode()
         self.mock_client.get.return_value = mock_response
         
         df, error = await load_market_data_stooq_daily("AAPL", "1y", self.mock_client)
@@ -298,7 +386,7 @@ class TestLoadMarketDataStooqDaily(unittest.IsolatedAsyncioTestCase):
         
         mock_response = AsyncMock()
         mock_response.status_code = 200
-        mock_response.text = csv_data
+        mock_response.content = csv_data.encode()
         self.mock_client.get.return_value = mock_response
         
         for period in ["1d", "5d", "1mo", "3mo", "6mo", "1y", "2y", "5y", "max"]:
@@ -321,7 +409,7 @@ class TestRetryLogic(unittest.IsolatedAsyncioTestCase):
                    ]))
         
         # Create success response for third call
-        success_response = AsyncMock(status_code=200, text=csv_data)
+        success_response = AsyncMock(status_code=200, content=csv_data.encode())
         
         # Fail twice, succeed on third - use side_effect as callable
         async def get_side_effect(*args, **kwargs):
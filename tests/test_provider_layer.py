@@ -6,7 +6,7 @@ import asyncio
 from unittest.mock import AsyncMock
 from datetime import datetime
 
-from chatbot.providers.cache_v2 import DataCache
+from chatbot.providers.cache_v2 import DataCache, _decode_ohlcv
 from chatbot.providers.market_router import (
     ProviderResult,
     EtfFactsProvider,
@@ -30,6 +30,7 @@ class TestDataCache:
     
     def teardown_method(self):
         """Clean up test cache."""
+        self.cache.close()
         if Path(self.cache_path).exists():
             Path(self.cache_path).unlink()
     
@@ -78,6 +79,74 @@ class TestDataCache:
         
         assert retrieved == facts
 
+    def test_ohlcv_sqlite_roundtrip_binary_payload(self):
+        """OHLCV persisted to SQLite should reload with index and dtypes intact."""
+        import pandas as pd
+
+        key = "roundtrip:AAPL:1y:1d"
+        df = pd.DataFrame(
+            {
+                "Open": [100.0, 101.0],
+                "High": [101.0, 102.0],
+                "Low": [99.0, 100.0],
+                "Close": [100.5, 101.5],
+                "Volume": [1000, 1100],
+            },
+            index=pd.date_range("2024-01-01", periods=2, tz="America/New_York", name="Date"),
+        )
+
+        self.cache.set_ohlcv(key, df, ttl_seconds=3600)
+        self.cache.mem_cache.clear()
+        retrieved = self.cache.get_ohlcv(key)
+
+        pd.testing.assert_frame_equal(retrieved, df, check_freq=False)
+
+    def test_ohlcv_sqlite_roundtrip_second_resolution_index(self):
+        """A non-ns index (e.g. Finnhub's unix-second timestamps) reloads with the same dates."""
+        import pandas as pd
+
+        key = "roundtrip:AAPL:1y:1d:s"
+        index = pd.to_datetime([1704067200, 1704153600], unit="s").as_unit("s")
+        df = pd.DataFrame({"Close": [100.5, 101.5]}, index=index)
+
+        self.cache.set_ohlcv(key, df, ttl_seconds=3600)
+        self.cache.mem_cache.clear()
+        retrieved = self.cache.get_ohlcv(key)
+
+        pd.testing.assert_index_equal(retrieved.index, index.as_unit("ns"))
+
+    def test_compact_ohlcv_downcasts_persisted_payload_only(self):
+        """compact_ohlcv persists float32 prices but hands back float64 from both layers."""
+        import numpy as np
+        import pandas as pd
+
+        cache = DataCache(self.cache_path, compact_ohlcv=True)
+        key = "compact:AAPL:1y:1d"
+        df = pd.DataFrame(
+            {
+                "Open": [100.0, 101.0],
+                "High": [101.0, 102.0],
+                "Low": [99.0, 100.0],
+                "Close": [100.5, 101.5],
+                "Volume": [1000.0, 1100.0],
+            },
+            index=pd.date_range("2024-01-01", periods=2, name="Date"),
+        )
+
+        cache.set_ohlcv(key, df, ttl_seconds=3600)
+        in_ram = cache.get_ohlcv(key)
+        cache.mem_cache.clear()
+        from_db = cache.get_ohlcv(key)
+        payload = cache._conn.execute(
+            "SELECT payload_parquet FROM ohlcv_cache WHERE key = ?", (key,)
+        ).fetchone()[0]
+
+        assert _decode_ohlcv(payload)["Close"].dtype == np.float32
+        for frame in (in_ram, from_db):
+            assert frame["Close"].dtype == np.float64
+            assert frame["Volume"].dtype == np.float64
+        assert df["Close"].dtype == np.float64  # caller's frame untouched
+
     def test_ohlcv_sqlite_promotion_preserves_remaining_ttl(self):
         """RAM cache TTL should not be extended beyond persisted DB TTL."""
         import pandas as pd
@@ -105,6 +174,40 @@ class TestDataCache:
         remaining = (expiry - datetime.now()).total_seconds()
         assert remaining <= 2.5
 
+    def test_shared_connection_uses_wal(self):
+        """SQLite layer keeps one WAL-mode connection for all calls."""
+        conn = self.cache._conn
+        self.cache.set_meta("meta:AAPL", {"name": "Apple"})
+        self.cache.mem_cache.clear()
+
+        assert self.cache.get_meta("meta:AAPL") == {"name": "Apple"}
+        assert self.cache._conn is conn
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    def test_get_ohlcv_many_reads_ram_and_sqlite(self):
+        """Bulk read returns RAM and SQLite hits together and skips unknown keys."""
+        import pandas as pd
+
+        df = pd.DataFrame(
+            {
+                "Open": [100.0],
+                "High": [101.0],
+                "Low": [99.0],
+                "Close": [100.5],
+                "Volume": [1000],
+            },
+            index=pd.date_range("2024-01-01", periods=1, name="Date"),
+        )
+        self.cache.set_ohlcv("many:AAPL", df, ttl_seconds=3600)
+        self.cache.set_ohlcv("many:MSFT", df, ttl_seconds=3600)
+        del self.cache.mem_cache["many:MSFT"]
+
+        found = self.cache.get_ohlcv_many(["many:AAPL", "many:MSFT", "many:NOPE"])
+
+        assert set(found) == {"many:AAPL", "many:MSFT"}
+        pd.testing.assert_frame_equal(found["many:MSFT"], df, check_freq=False)
+        assert "many:MSFT" in self.cache.mem_cache
+
 
 class TestProviderResult:
     """Test ProviderResult dataclass."""
@@ -162,6 +265,15 @@ class TestEtfFactsProvider:
         assert "Vanguard" in facts["name"]
         assert facts["currency"] == "USD"
     
+    def test_etf_facts_local_hit_is_shared_read_only(self):
+        """Test local facts are returned without copying and cannot be mutated."""
+        first = self.provider.get_facts("VTI")
+        second = self.provider.get_facts("vti")
+
+        assert first is second
+        with pytest.raises(TypeError):
+            first["currency"] = "EUR"
+
     def test_etf_facts_not_found(self):
         """Test non-existent ETF."""
         facts = self.provider.get_facts("NONEXISTENT")
@@ -226,6 +338,143 @@ class TestProviderYFinance:
         for col in ['Open', 'High', 'Low', 'Close', 'Volume']:
             assert pd.api.types.is_numeric_dtype(normalized[col])
 
+    def test_provider_normalize_keeps_numeric_dtypes(self):
+        """Test already-numeric frames keep their dtypes through normalization."""
+        import pandas as pd
+
+        provider = ProviderYFinance(self.cache, semaphore=None)
+        df = pd.DataFrame({
+            'Open': [100.0, 101.0],
+            'High': [101.0, 102.0],
+            'Low': [99.0, 100.0],
+            'Close': [100.5, 101.5],
+            'Volume': [1000000, 1100000]
+        }, index=pd.date_range('2024-01-01', periods=2))
+
+        normalized = provider._normalize_ohlcv(df, "TEST")
+
+        assert normalized['Close'].dtype == 'float64'
+        assert normalized['Volume'].dtype == 'int64'
+
+    def test_provider_normalize_coerces_only_non_numeric_columns(self):
+        """Test string columns are coerced while numeric ones keep their dtype."""
+        import pandas as pd
+
+        provider = ProviderYFinance(self.cache, semaphore=None)
+        df = pd.DataFrame({
+            'Open': [100.0, 101.0],
+            'High': [101.0, 102.0],
+            'Low': [99.0, 100.0],
+            'Close': ['100.5', 'n/a'],
+            'Volume': [1000000, 1100000]
+        }, index=pd.date_range('2024-01-01', periods=2))
+
+        normalized = provider._normalize_ohlcv(df, "TEST")
+
+        assert len(normalized) == 1
+        assert normalized['Close'].iloc[0] == 100.5
+        assert normalized['Volume'].dtype == 'int64'
+
+    def test_provider_normalize_flattens_multiindex(self):
+        """Test yf.download-style (Price, Ticker) columns are flattened."""
+        import pandas as pd
+
+        provider = ProviderYFinance(self.cache, semaphore=None)
+        columns = pd.MultiIndex.from_product(
+            [["Adj Close", "Close", "High", "Low", "Open", "Volume"], ["AAPL"]],
+            names=["Price", "Ticker"],
+        )
+        df = pd.DataFrame(1.0, index=pd.date_range('2024-01-01', periods=2), columns=columns)
+
+        normalized = provider._normalize_ohlcv(df, "AAPL")
+
+        assert normalized is not None
+        assert list(normalized.columns) == ['Open', 'High', 'Low', 'Close', 'Volume']
+
+    def test_download_uses_shared_session_history(self, monkeypatch):
+        """Test downloads go through Ticker.history on the shared session."""
+        import chatbot.providers.market_router as market_router
+
+        calls = []
+
+        class _FakeTicker:
+            def __init__(self, ticker, session=None):
+                calls.append((ticker, session))
+
+            def history(self, **kwargs):
+                calls.append(kwargs)
+                return None
+
+        monkeypatch.setattr(market_router.yf, "Ticker", _FakeTicker)
+
+        ProviderYFinance._download_sync("AAPL", "1y", "1d")
+        ProviderYFinance._download_sync("MSFT", "1y", "1d")
+
+        assert calls[0] == ("AAPL", market_router._YF_SESSION)
+        assert calls[1] == {"period": "1y", "interval": "1d", "auto_adjust": False}
+        assert calls[2][1] is calls[0][1]
+
+    def test_daily_history_index_is_tz_naive(self, monkeypatch):
+        """Test daily bars drop the exchange tz so they join with other providers."""
+        import pandas as pd
+        import chatbot.providers.market_router as market_router
+
+        index = pd.date_range('2024-01-02', periods=3, tz='America/New_York')
+        frame = pd.DataFrame({'Close': [1.0, 2.0, 3.0]}, index=index)
+
+        class _FakeTicker:
+            def __init__(self, ticker, session=None):
+                pass
+
+            def history(self, **kwargs):
+                return frame.copy()
+
+        monkeypatch.setattr(market_router.yf, "Ticker", _FakeTicker)
+
+        daily = ProviderYFinance._download_sync("AAPL", "1y", "1d")
+        intraday = ProviderYFinance._download_sync("AAPL", "5d", "1h")
+        stooq_like = pd.Series([1.0, 2.0, 3.0], index=pd.date_range('2024-01-02', periods=3))
+
+        assert daily.index.tz is None
+        assert list(daily.index) == list(stooq_like.index)
+        assert pd.concat([daily['Close'], stooq_like], axis=1).shape == (3, 2)
+        assert intraday.index.tz is not None
+
+    def test_fetch_many_splits_batched_frame(self, monkeypatch):
+        """Test a group_by='ticker' batch is split into per-ticker frames."""
+        import pandas as pd
+
+        provider = ProviderYFinance(self.cache, semaphore=asyncio.Semaphore(1))
+        index = pd.date_range('2024-01-01', periods=2)
+        columns = pd.MultiIndex.from_product(
+            [["AAPL", "BAD"], ["Open", "High", "Low", "Close", "Adj Close", "Volume"]]
+        )
+        raw = pd.DataFrame(1.0, index=index, columns=columns)
+        raw["BAD"] = float("nan")
+        monkeypatch.setattr(ProviderYFinance, "_download_many_sync", staticmethod(lambda *a: raw))
+
+        frames = asyncio.run(provider.fetch_ohlcv_many(["AAPL", "BAD", "MISSING"], "1y", "1d"))
+
+        assert list(frames) == ["AAPL"]
+        assert list(frames["AAPL"].columns) == ['Open', 'High', 'Low', 'Close', 'Volume']
+        assert len(frames["AAPL"]) == 2
+
+    def test_fetch_non_retryable_error_fails_fast(self, monkeypatch):
+        """Test errors that cannot succeed on retry skip the remaining attempts."""
+        provider = ProviderYFinance(self.cache, semaphore=asyncio.Semaphore(1))
+        calls = []
+
+        def _boom(*args):
+            calls.append(args)
+            raise KeyError("no data for this ticker")
+
+        monkeypatch.setattr(ProviderYFinance, "_download_sync", staticmethod(_boom))
+
+        result = asyncio.run(provider.fetch_ohlcv("NOPE", "1y", "1d"))
+
+        assert not result.success
+        assert len(calls) == 1
+
 
 class TestProviderStooq:
     """Test Stooq provider."""
@@ -253,6 +502,22 @@ class TestProviderStooq:
         # Stooq should handle whitespace in column names
         assert len(df) == 1
 
+    def test_singapore_parse_csv_from_bytes(self):
+        """Test Singapore CSV parsing straight from response bytes."""
+        import pandas as pd
+        from chatbot.providers.market_router import ProviderSingapore
+
+        csv_data = b"""Date,Open,High,Low,Close,Volume
+2024-01-02,101,102,100,101.5,1100000
+2024-01-01,100,101,99,100.5,1000000"""
+
+        df = ProviderSingapore._parse_singapore_csv(csv_data)
+
+        assert df is not None
+        assert isinstance(df.index, pd.DatetimeIndex)
+        assert df.index.is_monotonic_increasing
+        assert df['Close'].tolist() == [100.5, 101.5]
+
 
 class _DummyProvider:
     def __init__(self, name: str, result: ProviderResult):
@@ -309,6 +574,31 @@ class TestRouterPolicy:
         assert result.success is True
         assert result.provider == "p1"
 
+    def test_compact_cache_miss_and_hit_return_float64(self):
+        """With compact_ohlcv, a miss, a RAM hit and a SQLite hit all return float64 prices."""
+        import numpy as np
+        import pandas as pd
+
+        df = self._mk_df(3)
+        df["Close"] = [1234.5678, 1235.4321, 1236.789]
+        p1 = _DummyProvider("p1", ProviderResult(success=True, data=df, provider="p1"))
+        cache = DataCache(str(Path(self.temp_dir) / "compact.db"), compact_ohlcv=True)
+        router = MarketDataRouter(cache=cache, http_client=AsyncMock(), semaphore=AsyncMock())
+        router.providers = [p1]
+
+        miss = asyncio.run(router.get_ohlcv("AAPL", period="1y", interval="1d", min_rows=1))
+        ram_hit = asyncio.run(router.get_ohlcv("AAPL", period="1y", interval="1d", min_rows=1))
+        cache.mem_cache.clear()
+        disk_hit = asyncio.run(router.get_ohlcv("AAPL", period="1y", interval="1d", min_rows=1))
+
+        assert miss.provider == "p1"
+        assert ram_hit.provider == disk_hit.provider == "router-cached"
+        # Callers never see float32; only the SQLite payload is compact
+        assert miss.data["Close"].tolist() == [1234.5678, 1235.4321, 1236.789]
+        pd.testing.assert_frame_equal(miss.data, ram_hit.data)
+        pd.testing.assert_frame_equal(miss.data, disk_hit.data, check_freq=False, rtol=1e-6)
+        assert disk_hit.data["Close"].dtype == np.float64
+
     def test_rate_limit_sets_cooldown_and_skips_provider(self):
         p_rate_limited = _DummyProvider(
             "rate-limited",
@@ -367,6 +657,217 @@ class TestRouterPolicy:
         remaining = until_ts - time.time()
         assert remaining >= 6
 
+    def test_slow_provider_is_hedged_by_next(self, monkeypatch):
+        import chatbot.providers.market_router as market_router
+
+        monkeypatch.setattr(market_router, "PROVIDER_HEDGE_DELAY", 0.01)
+        cancelled = []
+
+        async def _slow_fetch(*args):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        p_slow = _DummyProvider("slow", ProviderResult(success=False, provider="slow"))
+        p_slow.fetch_ohlcv = _slow_fetch
+        p_ok = _DummyProvider(
+            "ok",
+            ProviderResult(success=True, data=self._mk_df(40), provider="ok"),
+        )
+        router = MarketDataRouter(
+            cache=self.cache,
+            http_client=AsyncMock(),
+            semaphore=AsyncMock(),
+        )
+        router.providers = [p_slow, p_ok]
+
+        result = asyncio.run(router.get_ohlcv("AAPL", period="1y", interval="1d", min_rows=30))
+
+        assert result.success is True
+        assert result.provider == "ok"
+        assert cancelled == [True]
+
+    def test_cancelled_losers_finish_before_result_returns(self):
+        cleaned_up = []
+
+        async def _slow_fetch(*args):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                await asyncio.sleep(0)  # Cleanup that needs the loop
+                cleaned_up.append(True)
+                raise
+
+        p_slow = _DummyProvider("slow", ProviderResult(success=False, provider="slow"))
+        p_slow.fetch_ohlcv = _slow_fetch
+        p_ok = _DummyProvider(
+            "ok",
+            ProviderResult(success=True, data=self._mk_df(40), provider="ok"),
+        )
+        router = MarketDataRouter(
+            cache=self.cache,
+            http_client=AsyncMock(),
+            semaphore=AsyncMock(),
+        )
+        router.providers = [p_slow, p_ok]
+
+        async def _run():
+            result = await router.get_ohlcv("AAPL", period="1y", interval="1d", race_mode=True)
+            return result, list(cleaned_up)
+
+        result, cleaned_at_return = asyncio.run(_run())
+
+        assert result.provider == "ok"
+        assert cleaned_at_return == [True]
+
+    def test_quota_limited_provider_not_started_while_first_pending(self, monkeypatch):
+        import chatbot.providers.market_router as market_router
+
+        monkeypatch.setattr(market_router, "PROVIDER_HEDGE_DELAY", 0.01)
+        started = []
+
+        async def _slow_failure(*args):
+            await asyncio.sleep(0.1)
+            started.append(("slow-done", p_quota.fetch_ohlcv.call_count))
+            return ProviderResult(success=False, error="timeout", provider="Finnhub")
+
+        p_slow = _DummyProvider("Finnhub", ProviderResult(success=False, provider="Finnhub"))
+        p_slow.fetch_ohlcv = _slow_failure
+        p_quota = _DummyProvider(
+            "TwelveData",
+            ProviderResult(success=True, data=self._mk_df(40), provider="TwelveData"),
+        )
+        router = MarketDataRouter(
+            cache=self.cache,
+            http_client=AsyncMock(),
+            semaphore=AsyncMock(),
+        )
+        router.providers = [p_slow, p_quota]
+
+        result = asyncio.run(router.get_ohlcv("AAPL", period="1y", interval="1d"))
+
+        assert result.provider == "TwelveData"
+        # The quota-limited provider was only called after the first one finished
+        assert started == [("slow-done", 0)]
+        assert p_quota.fetch_ohlcv.call_count == 1
+
+    def test_slow_quota_head_hedges_with_keyless_provider(self, monkeypatch):
+        import chatbot.providers.market_router as market_router
+
+        monkeypatch.setattr(market_router, "PROVIDER_HEDGE_DELAY", 0.01)
+
+        async def _slow_fetch(*args):
+            await asyncio.sleep(5)
+            return ProviderResult(success=False, provider="Finnhub")
+
+        p_slow = _DummyProvider("Finnhub", ProviderResult(success=False, provider="Finnhub"))
+        p_slow.fetch_ohlcv = _slow_fetch
+        p_quota = _DummyProvider(
+            "TwelveData",
+            ProviderResult(success=True, data=self._mk_df(40), provider="TwelveData"),
+        )
+        p_stooq = _DummyProvider(
+            "Stooq",
+            ProviderResult(success=True, data=self._mk_df(40), provider="stooq"),
+        )
+        router = MarketDataRouter(
+            cache=self.cache,
+            http_client=AsyncMock(),
+            semaphore=AsyncMock(),
+        )
+        router.providers = [p_slow, p_quota, p_stooq]
+
+        result = asyncio.run(router.get_ohlcv("AAPL", period="1y", interval="1d"))
+
+        # Stooq is hedged past the queued quota-limited provider
+        assert result.provider == "stooq"
+        assert p_stooq.fetch_ohlcv.call_count == 1
+        assert p_quota.fetch_ohlcv.call_count == 0
+
+    def test_provider_chain_gives_up_at_deadline(self, monkeypatch):
+        import chatbot.providers.market_router as market_router
+
+        monkeypatch.setattr(market_router, "PROVIDER_CHAIN_DEADLINE", 0.05)
+        cancelled = []
+
+        async def _hung_fetch(*args):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.append(True)
+                raise
+
+        p_hung = _DummyProvider("hung", ProviderResult(success=False, provider="hung"))
+        p_hung.fetch_ohlcv = _hung_fetch
+        router = MarketDataRouter(
+            cache=self.cache,
+            http_client=AsyncMock(),
+            semaphore=AsyncMock(),
+        )
+        router.providers = [p_hung]
+
+        result = asyncio.run(router.get_ohlcv("AAPL", period="1y", interval="1d", min_rows=30))
+
+        assert result.success is False
+        assert result.error == "deadline"
+        assert cancelled == [True]
+
+    def test_deadline_tries_untried_keyless_providers(self, monkeypatch):
+        import chatbot.providers.market_router as market_router
+
+        monkeypatch.setattr(market_router, "PROVIDER_CHAIN_DEADLINE", 0.05)
+        monkeypatch.setattr(market_router, "PROVIDER_HEDGE_DELAY", 10.0)
+
+        async def _hung_fetch(*args):
+            await asyncio.sleep(10)
+
+        p_hung = _DummyProvider("AlphaVantage", ProviderResult(success=False, provider="AlphaVantage"))
+        p_hung.fetch_ohlcv = _hung_fetch
+        p_quota = _DummyProvider("Polygon", ProviderResult(success=False, provider="Polygon"))
+        p_stooq = _DummyProvider(
+            "Stooq",
+            ProviderResult(success=True, data=self._mk_df(40), provider="stooq"),
+        )
+        router = MarketDataRouter(
+            cache=self.cache,
+            http_client=AsyncMock(),
+            semaphore=AsyncMock(),
+        )
+        router.providers = [p_hung, p_quota, p_stooq]
+
+        result = asyncio.run(router.get_ohlcv("AAPL", period="1y", interval="1d"))
+
+        # Stooq never got a hedge slot, but is still tried before giving up
+        assert result.provider == "stooq"
+        assert p_quota.fetch_ohlcv.call_count == 0
+
+    def test_race_mode_returns_fastest_provider(self):
+        async def _slow_success(*args):
+            await asyncio.sleep(0.05)
+            return ProviderResult(success=True, data=self._mk_df(40), provider="slow")
+
+        p_slow = _DummyProvider("slow", ProviderResult(success=False, provider="slow"))
+        p_slow.fetch_ohlcv = _slow_success
+        p_fast = _DummyProvider(
+            "fast",
+            ProviderResult(success=True, data=self._mk_df(40), provider="fast"),
+        )
+        router = MarketDataRouter(
+            cache=self.cache,
+            http_client=AsyncMock(),
+            semaphore=AsyncMock(),
+        )
+        router.providers = [p_slow, p_fast]
+
+        raced = asyncio.run(router.get_ohlcv("AAPL", period="1y", interval="1d", race_mode=True))
+        router.cache.clear_all()
+        ordered = asyncio.run(router.get_ohlcv("AAPL", period="1y", interval="1d"))
+
+        assert raced.provider == "fast"
+        assert ordered.provider == "slow"
+
     def test_router_level_cache_skips_provider_chain_on_hot_key(self):
         p1 = _DummyProvider(
             "p1",
@@ -389,6 +890,24 @@ class TestRouterPolicy:
         assert second.provider == "router-cached"
         assert p1.fetch_ohlcv.call_count == 1
 
+    def test_router_cache_key_ignores_ticker_case(self):
+        p1 = _DummyProvider(
+            "p1",
+            ProviderResult(success=True, data=self._mk_df(3), provider="p1"),
+        )
+        router = MarketDataRouter(
+            cache=self.cache,
+            http_client=AsyncMock(),
+            semaphore=AsyncMock(),
+        )
+        router.providers = [p1]
+
+        asyncio.run(router.get_ohlcv("aapl", period="1d", interval="1d", min_rows=1))
+        second = asyncio.run(router.get_ohlcv("AAPL", period="1d", interval="1d", min_rows=1))
+
+        assert second.provider == "router-cached"
+        assert p1.fetch_ohlcv.call_count == 1
+
     def test_fast_portfolio_fallback_for_exchange_suffix_short_horizon(self):
         p1 = _DummyProvider(
             "p1",
@@ -463,6 +982,163 @@ class TestFinnhubRateLimitPropagation:
         assert result.success is False
         assert result.error == "rate_limit"
 
+    def test_429_retry_goes_through_rate_limiter(self, monkeypatch):
+        """A short Retry-After is waited out by acquire() instead of a capped sleep."""
+        from chatbot.providers import finnhub as finnhub_module
+
+        http_client = AsyncMock()
+        response = AsyncMock()
+        response.status_code = 429
+        response.headers = {"Retry-After": "3"}
+        http_client.get.return_value = response
+
+        provider = FinnhubProvider(api_key="test", cache=self.cache, http_client=http_client)
+        provider.rate_limiter.acquire = AsyncMock(return_value=True)
+        sleep = AsyncMock()
+        monkeypatch.setattr(finnhub_module.asyncio, "sleep", sleep)
+
+        result = asyncio.run(provider._fetch_with_retry("https://example.test", {}, max_retries=2))
+
+        assert result is None
+        assert http_client.get.call_count == 3
+        assert provider.rate_limiter.acquire.call_count == 2
+        assert provider.rate_limiter.cooldown_until > 0
+        assert all(call.args[0] <= 0.5 for call in sleep.call_args_list)
+        assert provider._last_candles_retry_after_seconds == 3
+
+    def test_long_retry_after_gives_up_without_waiting(self):
+        """A long Retry-After returns rate_limit at once so the router can cool Finnhub down."""
+        http_client = AsyncMock()
+        response = AsyncMock()
+        response.status_code = 429
+        response.headers = {"Retry-After": "60"}
+        http_client.get.return_value = response
+
+        provider = FinnhubProvider(api_key="test", cache=self.cache, http_client=http_client)
+        provider.rate_limiter.acquire = AsyncMock(return_value=True)
+
+        result = asyncio.run(provider.fetch_ohlcv("AAPL", period="1y", interval="1d"))
+
+        assert result.error == "rate_limit"
+        assert result.retry_after_seconds == 60
+        assert http_client.get.call_count == 1
+        # Only the initial token; no retry waits on the shared limiter
+        assert provider.rate_limiter.acquire.call_count == 1
+        assert provider.rate_limiter.cooldown_until == 0.0
+
+    def test_fetch_ohlcv_rejects_intraday_without_network(self):
+        http_client = AsyncMock()
+        provider = FinnhubProvider(api_key="test", cache=self.cache, http_client=http_client)
+        provider.rate_limiter.acquire = AsyncMock(return_value=True)
+
+        result = asyncio.run(provider.fetch_ohlcv("AAPL", period="1d", interval="5m"))
+        assert result.success is False
+        assert result.error == "unsupported_interval"
+        assert provider.rate_limiter.acquire.call_count == 0
+        assert http_client.get.call_count == 0
+
+    def test_backoff_is_jittered_and_capped(self):
+        for attempt in range(3):
+            delay = FinnhubProvider._backoff_seconds(attempt)
+            assert 2 ** attempt <= delay <= 2 ** attempt + 1.0
+        assert FinnhubProvider._backoff_seconds(10) == 20.0
+
+    def test_forbidden_window_skips_http_request(self):
+        import time
+
+        http_client = AsyncMock()
+        provider = FinnhubProvider(
+            api_key="test",
+            cache=self.cache,
+            http_client=http_client,
+            rpm=60,
+            rps=5,
+        )
+        provider._forbidden_until = time.time() + 300
+
+        result = asyncio.run(provider._fetch_with_retry("https://example.test", {}))
+        assert result is None
+        assert http_client.get.call_count == 0
+
+
+class TestFinnhubCandlesParsing:
+    def setup_method(self):
+        import tempfile
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache = DataCache(str(Path(self.temp_dir) / "test_cache.db"))
+        self.provider = FinnhubProvider(api_key="test", cache=self.cache, http_client=AsyncMock())
+
+    def teardown_method(self):
+        import shutil
+        if Path(self.temp_dir).exists():
+            shutil.rmtree(self.temp_dir)
+
+    def test_parse_candles_builds_sorted_float_frame(self):
+        response = {
+            "o": [2.0, 1.0, 3.0],
+            "h": [2.5, 1.5, 3.5],
+            "l": [1.5, 0.5, 2.5],
+            "c": [2.2, 1.2, None],
+            "v": [200, 100, 300],
+            "t": [1704153600, 1704067200, 1704240000],
+            "s": "ok",
+        }
+
+        df = self.provider._parse_candles_response(response, "AAPL")
+
+        assert list(df.columns) == ["Open", "High", "Low", "Close", "Volume"]
+        assert df.index.name == "Date"
+        assert len(df) == 2  # row with missing close dropped
+        assert df.index.is_monotonic_increasing
+        assert df["Close"].tolist() == [1.2, 2.2]
+        assert (df.dtypes == "float64").all()
+
+    def test_get_candles_caches_through_shared_fetch_path(self):
+        payload = {
+            "o": [1.0, 2.0], "h": [1.5, 2.5], "l": [0.5, 1.5], "c": [1.2, 2.2],
+            "v": [100, 200], "t": [1704067200, 1704153600], "s": "ok",
+        }
+        self.provider.rate_limiter.acquire = AsyncMock(return_value=True)
+        self.provider._fetch_with_retry = AsyncMock(return_value=payload)
+
+        first = asyncio.run(self.provider.get_candles("AAPL", from_ts=0, to_ts=10 ** 9))
+        second = asyncio.run(self.provider.get_candles("AAPL", from_ts=0, to_ts=10 ** 9))
+
+        assert len(first) == 2
+        assert second is first
+        assert self.provider._fetch_with_retry.call_count == 1
+        assert self.provider.rate_limiter.acquire.call_count == 1
+
+    def test_get_candles_ttl_short_window_vs_historical(self):
+        payload = {
+            "o": [1.0], "h": [1.5], "l": [0.5], "c": [1.2], "v": [100], "t": [1704067200], "s": "ok",
+        }
+        self.provider.rate_limiter.acquire = AsyncMock(return_value=True)
+        self.provider._fetch_with_retry = AsyncMock(return_value=payload)
+
+        asyncio.run(self.provider.get_candles("AAPL", from_ts=0, to_ts=86400))
+        asyncio.run(self.provider.get_candles("AAPL", from_ts=0, to_ts=30 * 86400))
+
+        now = datetime.now()
+        _df, short_expiry = self.cache.mem_cache["finnhub_candles:AAPL:D:0:86400"]
+        _df, long_expiry = self.cache.mem_cache[f"finnhub_candles:AAPL:D:0:{30 * 86400}"]
+        assert (short_expiry - now).total_seconds() <= 180
+        assert (long_expiry - now).total_seconds() > 180
+
+    def test_period_timestamps_use_unix_seconds(self):
+        import time
+
+        from_ts, to_ts = self.provider._compute_period_timestamps("1mo")
+        assert abs(to_ts - time.time()) < 5
+        assert to_ts - from_ts == 30 * 86400
+
+        from_ts, to_ts = self.provider._compute_period_timestamps("unknown")
+        assert to_ts - from_ts == 365 * 86400
+
+    def test_parse_candles_rejects_ragged_arrays(self):
+        response = {"o": [1.0], "h": [1.0], "l": [1.0], "c": [1.0], "v": [1], "t": [1, 2], "s": "ok"}
+        assert self.provider._parse_candles_response(response, "AAPL") is None
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -108,6 +108,32 @@ class TestSECCaching(unittest.TestCase):
         self.assertIsNotNone(cached_value)
         self.assertTrue(cached_value)
 
+    
+    async def test_company_facts_client_error_not_retried(self):
+        """Test that non-retryable HTTP errors fail fast without backoff."""
+        import httpx
+        
+        provider = SECEdgarProvider(
+            config=self.config,
+            cache=self.cache,
+            http_client=self.http_client,
+            semaphore=self.semaphore,
+            db=self.db
+        )
+        
+        request = httpx.Request("GET", "https://data.sec.gov")
+        response = httpx.Response(403, request=request)
+        mock_response = Mock()
+        mock_response.raise_for_status = Mock(
+            side_effect=httpx.HTTPStatusError("forbidden", request=request, response=response)
+        )
+        self.http_client.get = AsyncMock(return_value=mock_response)
+        
+        facts = await provider.get_company_facts("320193")
+        
+        self.assertIsNone(facts)
+        self.assertEqual(self.http_client.get.call_count, 1)
+
 
 # Run async tests
 def async_test(coro):
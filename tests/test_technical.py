@@ -0,0 +1,105 @@
+"""Unit tests for analytics.technical indicator helpers."""
+
+import unittest
+import pandas as pd
+import numpy as np
+
+from chatbot.analytics.technical import (
+    add_technical_indicators,
+    compute_rsi,
+    generate_analysis_text,
+)
+
+
+class TestAddTechnicalIndicators(unittest.TestCase):
+    """Test SMA/RSI columns against the pandas rolling definitions."""
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        close = 100 + rng.standard_normal(120).cumsum()
+        self.df = pd.DataFrame(
+            {"Close": close},
+            index=pd.date_range("2024-01-01", periods=120),
+        )
+
+    def test_sma_matches_pandas_rolling(self):
+        """SMA columns should equal Series.rolling().mean()."""
+        result = add_technical_indicators(self.df)
+
+        pd.testing.assert_series_equal(
+            result["SMA20"], self.df["Close"].rolling(20).mean(), check_names=False
+        )
+        pd.testing.assert_series_equal(
+            result["SMA50"], self.df["Close"].rolling(50).mean(), check_names=False
+        )
+
+    def test_input_frame_not_modified(self):
+        """Indicators are added to a copy."""
+        add_technical_indicators(self.df)
+        self.assertEqual(list(self.df.columns), ["Close"])
+
+    def test_multiindex_columns_supported(self):
+        """yf.download-style (Price, Ticker) columns still get indicators."""
+        df = self.df.copy()
+        df.columns = pd.MultiIndex.from_product([df.columns, ["AAPL"]])
+        result = add_technical_indicators(df)
+
+        self.assertAlmostEqual(
+            float(result["SMA20"].iloc[-1]),
+            float(self.df["Close"].iloc[-20:].mean()),
+        )
+
+    def test_reapplying_replaces_indicator_columns(self):
+        """Running twice should not duplicate indicator columns."""
+        result = add_technical_indicators(add_technical_indicators(self.df))
+        self.assertEqual(list(result.columns), ["Close", "SMA20", "SMA50", "RSI14"])
+
+    def test_nan_close_only_blanks_its_windows(self):
+        """A missing close should not poison SMA values after its window."""
+        self.df.iloc[10, 0] = np.nan
+        result = add_technical_indicators(self.df)
+
+        self.assertTrue(np.isnan(result["SMA20"].iloc[29]))
+        self.assertFalse(np.isnan(result["SMA20"].iloc[30]))
+
+
+class TestComputeRSI(unittest.TestCase):
+    """Test the series RSI helper."""
+
+    def test_flat_series_returns_50(self):
+        """Flat prices have no losses, so RSI falls back to 50."""
+        rsi = compute_rsi(pd.Series([100.0] * 30), period=14)
+        self.assertTrue((rsi == 50.0).all())
+
+    def test_keeps_input_index(self):
+        """RSI should be aligned with the input index."""
+        close = pd.Series(
+            np.linspace(100, 90, 30) + np.sin(np.arange(30)),
+            index=pd.date_range("2024-01-01", periods=30),
+        )
+        rsi = compute_rsi(close, period=14)
+
+        self.assertTrue(rsi.index.equals(close.index))
+        self.assertEqual(rsi.iloc[0], 50.0)
+        self.assertLess(rsi.iloc[-1], 50.0)
+
+
+class TestGenerateAnalysisText(unittest.TestCase):
+    """Test the text summary built from the latest bar."""
+
+    def test_uses_latest_bar(self):
+        """Price and daily change come from the last two closes."""
+        close = np.linspace(100, 160, 60)
+        df = add_technical_indicators(
+            pd.DataFrame({"Close": close}, index=pd.date_range("2024-01-01", periods=60))
+        )
+        text = generate_analysis_text("TEST", df)
+
+        self.assertIn("Price: 160.00", text)
+        self.assertIn(f"Daily change: {(close[-1] / close[-2] - 1) * 100:+.2f}%", text)
+        self.assertIn("uptrend", text)
+        self.assertIn("strong momentum", text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,11 +10,22 @@ from chatbot.utils import (
     validate_ticker,
     format_number,
     format_percentage,
+    loads_json,
     MESSAGE_MAX,
     CAPTION_MAX,
 )
 
 
+class TestLoadsJson:
+    """Tests for loads_json function."""
+    
+    def test_bytes_payload(self):
+        assert loads_json(b'{"s": "ok", "c": [1.5, 2.5]}') == {"s": "ok", "c": [1.5, 2.5]}
+    
+    def test_str_payload(self):
+        assert loads_json('{"rates": {"USD": 1.25}}') == {"rates": {"USD": 1.25}}
+
+
 class TestSafeFloat:
     """Tests for safe_float function."""
     